@@ -30,6 +30,7 @@ from config.database import (
 from utils.ai_resume_analyzer import AIResumeAnalyzer
 from utils.resume_builder import ResumeBuilder
 from utils.resume_analyzer import ResumeAnalyzer
+from utils.resume_document import ResumeDocument
 import traceback
 import plotly.express as px
 import pandas as pd
@@ -1353,8 +1354,9 @@ class ResumeApp:
                             st.error(f"Error reading file: {str(e)}")
                             return
 
-                        # Analyze the document
-                        analysis = self.analyzer.analyze_resume({'raw_text': text}, role_info)
+                        # Analyze the document; its text views are computed once and shared
+                        resume_document = ResumeDocument(text)
+                        analysis = self.analyzer.analyze_resume({'raw_text': resume_document}, role_info)
                         
                         # Check if analysis returned an error
                         if 'error' in analysis:
@@ -1487,6 +1489,19 @@ class ResumeApp:
 
                         st.markdown("</div>", unsafe_allow_html=True)
 
+                        # Best-fit roles across every category
+                        st.markdown("""
+                        <div class="feature-card">
+                            <h2>Best-Fitting Roles</h2>
+                        """, unsafe_allow_html=True)
+
+                        for fit in self.analyzer.rank_roles(resume_document, top_k=3):
+                            st.markdown(f"**{fit['role']}** ({fit['category']}): {int(fit['score'])}% match")
+                            if fit['missing_skills']:
+                                st.caption("Missing: " + ", ".join(fit['missing_skills']))
+
+                        st.markdown("</div>", unsafe_allow_html=True)
+
                     with col2:
                         # Format Score Card
                         st.markdown("""
@@ -2367,6 +2382,9 @@ class ResumeApp:
                                     # For text files or other formats
                                     resume_text = uploaded_file.getvalue().decode('utf-8')
                                 
+                                # Preprocess once for every later stage
+                                resume_document = ResumeDocument(resume_text)
+                                
                                 # Initialize the AI analyzer (moved after text extraction)
                                 progress_bar.progress(30)
                                 
@@ -2380,13 +2398,13 @@ class ResumeApp:
                                 if use_custom_job_desc and custom_job_description:
                                     # Use custom job description for analysis
                                     analysis_result = analyzer.analyze_resume_with_gemini(
-                                        resume_text, job_role=job_role, job_description=custom_job_description)
+                                        resume_document, job_role=job_role, job_description=custom_job_description)
                                     # Show that custom job description was used
                                     st.session_state['used_custom_job_desc'] = True
                                 else:
                                     # Use standard role-based analysis
                                     analysis_result = analyzer.analyze_resume_with_gemini(
-                                        resume_text, job_role=job_role)
+                                        resume_document, job_role=job_role)
                                     st.session_state['used_custom_job_desc'] = False
 
                                 
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the resume extraction and analysis pipeline
+
+Usage:
+    python benchmark.py ocr [--pages 1 2 4 8] [--workers N]
+    python benchmark.py ocr-backends [--pages N] [--backends tesserocr pytesseract]
+    python benchmark.py engines [--corpus DIR] [--engines pypdf pdfium ...] [--repeat N]
+    python benchmark.py docx [--paragraphs N] [--tables N] [--rows N] [--repeat N]
+    python benchmark.py regex [--entries N] [--iterations N]
+    python benchmark.py skills [--sizes 140 1000 5000 20000] [--budget-ms MS] [--repeat N]
+    python benchmark.py spacy [--model en_core_web_sm] [--analyzers N] [--docs N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_LINES = [
+    "JOHN DOE",
+    "john.doe@example.com | 555-123-4567 | linkedin.com/in/johndoe",
+    "PROFESSIONAL SUMMARY",
+    "Software engineer with 6 years of experience building web services.",
+    "EXPERIENCE",
+    "- Developed REST APIs in Python and Django for 2M monthly users",
+    "- Led migration of legacy services to Docker and Kubernetes",
+    "- Implemented CI pipelines with Jenkins and GitHub Actions",
+    "EDUCATION",
+    "Bachelor of Technology in Computer Science, 2014 - 2018, GPA 3.7",
+    "SKILLS",
+    "Python, Java, SQL, React, AWS, Docker, Kubernetes, Git",
+]
+
+
+def make_scanned_pdf(path, pages, dpi=200):
+    """Write an image-only PDF of `pages` letter-size pages of resume text"""
+    from PIL import Image, ImageDraw
+
+    width, height = int(8.5 * dpi), int(11 * dpi)
+    images = []
+    for page in range(pages):
+        image = Image.new('L', (width, height), 255)
+        draw = ImageDraw.Draw(image)
+        y = dpi // 2
+        for _ in range(3):
+            for line in SAMPLE_LINES:
+                draw.text((dpi // 2, y), line, fill=0)
+                y += dpi // 6
+        draw.text((dpi // 2, height - dpi // 2), f"Page {page + 1}", fill=0)
+        images.append(image)
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=dpi)
+
+
+def bench_ocr(args):
+    """Wall-clock time of serial vs page-parallel OCR as page count grows"""
+    from utils.pdf_ocr import default_ocr_workers, ocr_pdf_pages
+
+    workers = args.workers or default_ocr_workers()
+    print(f"OCR scaling (parallel = {workers} worker processes)")
+    print(f"{'pages':>6} {'serial (s)':>12} {'parallel (s)':>14} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = os.path.join(tmp, f"scan_{pages}.pdf")
+            make_scanned_pdf(path, pages)
+            with open(path, 'rb') as f:
+                pdf_bytes = f.read()
+
+            start = time.perf_counter()
+            ocr_pdf_pages(pdf_bytes, max_workers=1, page_count=pages)
+            serial = time.perf_counter() - start
+
+            start = time.perf_counter()
+            ocr_pdf_pages(pdf_bytes, max_workers=workers, page_count=pages)
+            parallel = time.perf_counter() - start
+
+            print(f"{pages:>6} {serial:>12.2f} {parallel:>14.2f} {serial / parallel:>8.2f}x")
+
+
+def _percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def bench_ocr_backends(args):
+    """Per-page OCR latency and CPU of each Tesseract backend on the same page images"""
+    from utils.ocr_backends import OCR_BACKENDS, get_ocr_backend
+    from utils.pdf_ocr import rasterize_pages
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scan.pdf")
+        make_scanned_pdf(path, args.pages)
+        with open(path, 'rb') as f:
+            pdf_bytes = f.read()
+    images = [image for image, _ in rasterize_pages(pdf_bytes, 1, args.pages)]
+
+    print(f"OCR backends: {args.pages} page(s), {images[0].size[0]}x{images[0].size[1]} 1-bit")
+    print(f"{'backend':<12} {'start (ms)':>11} {'mean (ms)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} "
+          f"{'cpu/page (ms)':>14} {'chars':>7}")
+    for name in args.backends or list(OCR_BACKENDS):
+        start = time.perf_counter()
+        try:
+            backend = get_ocr_backend(name)
+        except Exception as e:
+            print(f"{name:<12} unavailable: {e}")
+            continue
+        startup = time.perf_counter() - start
+
+        latencies, chars = [], 0
+        # os.times() includes the CPU of finished child processes (pytesseract)
+        cpu_before = sum(os.times()[:4])
+        for image in images:
+            start = time.perf_counter()
+            chars += len(backend.image_to_string(image))
+            latencies.append(time.perf_counter() - start)
+        cpu = (sum(os.times()[:4]) - cpu_before) / len(images)
+
+        print(f"{name:<12} {startup * 1000:>11.1f} {sum(latencies) / len(latencies) * 1000:>10.1f} "
+              f"{_percentile(latencies, 0.5) * 1000:>9.1f} {_percentile(latencies, 0.95) * 1000:>9.1f} "
+              f"{cpu * 1000:>14.1f} {chars:>7}")
+
+
+def make_text_pdf(path, pages, columns=1):
+    """
+    Write a digital (text layer) resume PDF and return its reference text.
+    Two-column pages are drawn row by row across both columns, as many resume
+    builders do, while the reference reads each column top to bottom.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    width, height = letter
+    pdf = canvas.Canvas(path, pagesize=letter)
+    reference = []
+    for page in range(pages):
+        lines = [f"{line} ({page + 1}.{i})" for i, line in enumerate(SAMPLE_LINES * 2)]
+        column_lines = [lines[i::columns] for i in range(columns)]
+        column_width = (width - 72) / columns
+        for row in range(len(column_lines[0])):
+            for column, col_lines in enumerate(column_lines):
+                if row < len(col_lines):
+                    pdf.setFont('Helvetica', 9 if columns > 1 else 10)
+                    pdf.drawString(36 + column * column_width, height - 54 - row * 14, col_lines[row][:60])
+        for col_lines in column_lines:
+            reference.extend(line[:60] for line in col_lines)
+        pdf.showPage()
+    pdf.save()
+    return "\n".join(reference)
+
+
+def _word_f1(text, reference):
+    """F1 of the extracted word multiset against the reference words"""
+    from collections import Counter
+
+    extracted, expected = Counter(text.lower().split()), Counter(reference.lower().split())
+    overlap = sum((extracted & expected).values())
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / sum(extracted.values()), overlap / sum(expected.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def _order_fidelity(text, reference):
+    """Similarity of the word sequences (1.0 = reading order preserved)"""
+    from difflib import SequenceMatcher
+
+    return SequenceMatcher(None, text.lower().split(), reference.lower().split(), autojunk=False).ratio()
+
+
+def _load_corpus(args, tmp):
+    """Return [(name, pdf_bytes, reference text or None)] from --corpus or a generated one"""
+    corpus = []
+    if args.corpus:
+        for name in sorted(os.listdir(args.corpus)):
+            if not name.lower().endswith('.pdf'):
+                continue
+            with open(os.path.join(args.corpus, name), 'rb') as f:
+                pdf_bytes = f.read()
+            reference_path = os.path.join(args.corpus, os.path.splitext(name)[0] + '.txt')
+            reference = None
+            if os.path.exists(reference_path):
+                with open(reference_path, encoding='utf-8') as f:
+                    reference = f.read()
+            corpus.append((name, pdf_bytes, reference))
+        return corpus
+
+    for columns in (1, 2):
+        for pages in (1, 3):
+            path = os.path.join(tmp, f"resume_{columns}col_{pages}p.pdf")
+            reference = make_text_pdf(path, pages, columns)
+            with open(path, 'rb') as f:
+                corpus.append((os.path.basename(path), f.read(), reference))
+    return corpus
+
+
+def bench_engines(args):
+    """Throughput and text fidelity of every registered PDF text engine over a corpus"""
+    from utils.pdf_extraction import PDF_TEXT_ENGINES, iter_engine_pages, join_pages, score_text_quality
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = _load_corpus(args, tmp)
+    if not corpus:
+        print("No PDFs found in the corpus")
+        return
+    with_reference = sum(1 for _, _, reference in corpus if reference is not None)
+    print(f"PDF text engines: {len(corpus)} document(s), {with_reference} with reference text")
+    print(f"{'engine':<11} {'pages/s':>9} {'quality':>8} {'word F1':>8} {'order':>7}")
+
+    for engine in args.engines or list(PDF_TEXT_ENGINES):
+        pages = seconds = 0
+        quality, f1, order = [], [], []
+        try:
+            for _, pdf_bytes, reference in corpus:
+                best = float('inf')
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    page_texts = [page.text for page in iter_engine_pages(pdf_bytes, engine)]
+                    best = min(best, time.perf_counter() - start)
+                pages += len(page_texts)
+                seconds += best
+                text = join_pages(iter_engine_pages(pdf_bytes, engine))
+                quality.append(score_text_quality(text, page_texts))
+                if reference is not None:
+                    f1.append(_word_f1(text, reference))
+                    order.append(_order_fidelity(text, reference))
+        except Exception as e:
+            print(f"{engine:<11} unavailable: {e}")
+            continue
+
+        def mean(values):
+            return f"{sum(values) / len(values):.3f}" if values else "-"
+
+        print(f"{engine:<11} {pages / seconds:>9.1f} {mean(quality):>8} {mean(f1):>8} {mean(order):>7}")
+
+
+def make_table_heavy_docx(paragraphs, tables, rows, cols=4):
+    """Return the bytes of a DOCX with body paragraphs and skills-grid style tables"""
+    import io
+    from docx import Document
+
+    document = Document()
+    for i in range(paragraphs):
+        document.add_paragraph(SAMPLE_LINES[i % len(SAMPLE_LINES)])
+    for t in range(tables):
+        document.add_heading(f"SKILLS GRID {t + 1}", level=2)
+        table = document.add_table(rows=rows, cols=cols)
+        for r, row in enumerate(table.rows):
+            for c, cell in enumerate(row.cells):
+                cell.text = f"Skill {t}-{r}-{c}"
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _measure(fn, repeat):
+    """Return (best seconds, peak traced bytes) over `repeat` runs of fn"""
+    import tracemalloc
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def bench_docx(args):
+    """python-docx object model vs streaming document.xml parser"""
+    import io
+    from docx import Document
+    from utils.docx_extraction import extract_docx_text
+
+    docx_bytes = make_table_heavy_docx(args.paragraphs, args.tables, args.rows)
+
+    def python_docx():
+        return '\n'.join(paragraph.text for paragraph in Document(io.BytesIO(docx_bytes)).paragraphs)
+
+    def streaming():
+        return extract_docx_text(docx_bytes)
+
+    print(f"DOCX: {len(docx_bytes) / 1024:.0f} KB, {args.paragraphs} paragraphs, "
+          f"{args.tables} tables x {args.rows} rows")
+    print(f"{'extractor':<14} {'best (ms)':>10} {'peak mem (KB)':>14} {'chars':>9}")
+    for name, fn in (('python-docx', python_docx), ('streaming', streaming)):
+        seconds, peak = _measure(fn, args.repeat)
+        print(f"{name:<14} {seconds * 1000:>10.1f} {peak / 1024:>14.0f} {len(fn()):>9}")
+
+
+def bench_regex(args):
+    """Per-pattern re.search calls vs the precompiled regex bank, per resume"""
+    import re
+    from utils import regex_bank
+
+    experience = [' '.join(SAMPLE_LINES[5:8])] * args.entries
+    education = [SAMPLE_LINES[9]] * args.entries
+    text = '\n'.join(SAMPLE_LINES)
+
+    def per_pattern():
+        # The checks as analyze_resume and check_formatting used to write them
+        flags = [
+            any(re.search(r'\b(19|20)\d{2}\b', exp) for exp in experience),
+            any(re.search(r'[•\-\*]', exp) for exp in experience),
+            any(re.search(r'\b(developed|managed|created|implemented|designed|led|improved)\b',
+                          exp.lower()) for exp in experience),
+            any(re.search(r'\b(19|20)\d{2}\b', edu) for edu in education),
+            any(re.search(r'\b(bachelor|master|phd|b\.|m\.|diploma)\b', edu.lower()) for edu in education),
+            any(re.search(r'\b(gpa|cgpa|grade|percentage)\b', edu.lower()) for edu in education),
+        ]
+        contact = [r'\b[\w\.-]+@[\w\.-]+\.\w+\b', r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', r'linkedin\.com/\w+']
+        flags.append(any(re.search(pattern, text) for pattern in contact))
+        return flags
+
+    def bank():
+        return [regex_bank.scan_entries(experience, ('has_dates', 'has_bullets', 'has_action_verbs')),
+                regex_bank.scan_entries(education, ('has_dates', 'has_degree', 'has_gpa')),
+                regex_bank.has_contact_format(text)]
+
+    print(f"{args.entries} experience + {args.entries} education entries, {args.iterations} resumes")
+    print(f"{'matcher':<12} {'per resume (us)':>16}")
+    for name, fn in (('per-pattern', per_pattern), ('regex bank', bank)):
+        best = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            for _ in range(args.iterations):
+                fn()
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:<12} {best / args.iterations * 1e6:>16.1f}")
+
+
+def _synthetic_skills(count, seed=0):
+    """JOB_ROLES skills padded with random one- to three-word skill names up to count"""
+    import random
+    import string
+    from utils.skill_matcher import job_role_skills
+
+    rng = random.Random(seed)
+    skills = job_role_skills()
+    seen = {skill.lower() for skill in skills}
+    while len(skills) < count:
+        words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 11)))
+                 for _ in range(rng.choice((1, 1, 1, 2, 3)))]
+        name = ' '.join(words).title()
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            skills.append(name)
+    return skills
+
+
+# Typos and aliases the skill index must accept, and common words it must not read as skills
+SKILL_INDEX_CASES = [
+    ("Skilled in Pyhton, Kubernetis and Dokcer", ["Python", "Kubernetes", "Docker"], []),
+    ("Built ReactJS and NodeJS services on k8s with Postgres", ["React", "Node.js", "Kubernetes", "PostgreSQL"], []),
+    ("Mentoring junior engineers", [], ["Monitoring"]),
+    ("Prepared the court docket", [], ["Docker"]),
+    ("Balanced each node of the tree", [], ["Node.js"]),
+    ("Carried the torch for the team", [], ["PyTorch"]),
+    ("Shipped on time XD", [], ["Adobe XD"]),
+]
+
+
+def bench_skills(args):
+    """Per-resume SkillIndex latency as the vocabulary grows, against a naive fuzzy scan"""
+    from utils.skill_index import SkillIndex, compact, edit_distance, get_skill_index, tokenize, typo_limit
+
+    # A resume with aliases and typos, about 700 words
+    resume = '\n'.join(SAMPLE_LINES * 6 + [
+        "Built ReactJS and NodeJS services on k8s with Postgres",
+        "Skilled in Pyhton, Kubernetis, Dokcer, JS and ML pipelines",
+    ] * 6)
+
+    def naive(skills, text):
+        # Every unmatched token against every skill with a bounded edit distance
+        keys = {compact(skill) for skill in skills}
+        found = set()
+        for token in {compact(token) for line in text.lower().split('\n') for token in tokenize(line)}:
+            if token in keys:
+                found.add(token)
+                continue
+            for key in keys:
+                limit = typo_limit(token, key) if token else 0
+                if limit and edit_distance(token, key, limit) <= limit:
+                    found.add(key)
+        return found
+
+    # Regression cases: (text, skills that must be found, skills that must not be)
+    failures = []
+    index = get_skill_index()
+    for text, expected, unexpected in SKILL_INDEX_CASES:
+        found = index.find(text)
+        keys = {index.canonical(skill) for skill in expected}, {index.canonical(skill) for skill in unexpected}
+        if not keys[0] <= set(found) or keys[1] & set(found):
+            failures.append(f"{text!r}: found {sorted(found)}")
+    print(f"Match checks: {len(SKILL_INDEX_CASES) - len(failures)}/{len(SKILL_INDEX_CASES)} ok")
+    for failure in failures:
+        print(f"  FAIL {failure}")
+
+    print(f"Resume: {len(resume.split())} words; budget {args.budget_ms:.1f} ms per resume")
+    print(f"{'skills':>7} {'build (ms)':>11} {'cold (ms)':>10} {'warm (ms)':>10} {'naive (ms)':>11} "
+          f"{'found':>6} {'budget':>7}")
+    for size in args.sizes:
+        skills = _synthetic_skills(size)
+        start = time.perf_counter()
+        index = SkillIndex(skills)
+        build = time.perf_counter() - start
+
+        # Cold: first resume seen; warm: typo lookups of its tokens already remembered
+        start = time.perf_counter()
+        index.find(resume)
+        cold = time.perf_counter() - start
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            found = index.find(resume)
+            best = min(best, time.perf_counter() - start)
+
+        # The naive scan grows with the vocabulary; only time it while it is affordable
+        naive_ms = '-'
+        if size <= args.naive_limit:
+            start = time.perf_counter()
+            naive(skills, resume)
+            naive_ms = f"{(time.perf_counter() - start) * 1000:.1f}"
+
+        verdict = 'ok' if cold * 1000 <= args.budget_ms else 'OVER'
+        print(f"{size:>7} {build * 1000:>11.1f} {cold * 1000:>10.2f} {best * 1000:>10.2f} {naive_ms:>11} "
+              f"{len(found):>6} {verdict:>7}")
+
+
+def _spacy_child(args):
+    """Construct analyzers and analyze docs in this (fresh) process; print JSON stats"""
+    import json
+    import resource
+    import spacy
+    import resume_analytics.analyzer as analytics
+
+    if args.child == 'per-instance':
+        # Previous behaviour: every analyzer loads the complete pipeline
+        analytics.get_nlp = lambda model, warm_up=False: spacy.load(model)
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    construct = []
+    analyzers = []
+    for _ in range(args.analyzers):
+        start = time.perf_counter()
+        analyzers.append(analytics.ResumeAnalyzer(args.model))
+        construct.append(time.perf_counter() - start)
+
+    resume = '\n'.join(SAMPLE_LINES * 4)
+    start = time.perf_counter()
+    for index in range(args.docs):
+        analyzers[index % len(analyzers)].analyze_resume(resume)
+    analyze = (time.perf_counter() - start) / args.docs
+
+    print(json.dumps({
+        'first_ms': construct[0] * 1000,
+        'next_ms': sum(construct[1:]) / max(1, len(construct) - 1) * 1000,
+        'analyze_ms': analyze * 1000,
+        'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 / 2 ** 20,
+        'rss_added_mb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 - rss_before) / 2 ** 20,
+        'pipeline': analyzers[0].nlp.pipe_names
+    }))
+
+
+def bench_spacy(args):
+    """Per-instance full spaCy pipelines vs the shared trimmed pipeline, each in a fresh process"""
+    import json
+    import subprocess
+
+    if args.child:
+        return _spacy_child(args)
+
+    print(f"model {args.model}: {args.analyzers} analyzers, {args.docs} resumes")
+    print(f"{'mode':<13} {'1st (ms)':>9} {'next (ms)':>10} {'doc (ms)':>9} {'peak RSS (MB)':>14} "
+          f"{'added (MB)':>11}  pipeline")
+    for mode in ('per-instance', 'shared'):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), 'spacy', '--child', mode, '--model', args.model,
+             '--analyzers', str(args.analyzers), '--docs', str(args.docs)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        stats = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:<13} {stats['first_ms']:>9.1f} {stats['next_ms']:>10.1f} {stats['analyze_ms']:>9.2f} "
+              f"{stats['rss_mb']:>14.1f} {stats['rss_added_mb']:>11.1f}  {','.join(stats['pipeline'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume pipeline benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ocr_parser = subparsers.add_parser('ocr', help="Serial vs page-parallel OCR scaling")
+    ocr_parser.add_argument('--pages', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    ocr_parser.add_argument('--workers', type=int, default=None)
+    ocr_parser.set_defaults(func=bench_ocr)
+
+    backends_parser = subparsers.add_parser('ocr-backends', help="Per-page latency of each OCR backend")
+    backends_parser.add_argument('--pages', type=int, default=8)
+    backends_parser.add_argument('--backends', nargs='+', default=None)
+    backends_parser.set_defaults(func=bench_ocr_backends)
+
+    engines_parser = subparsers.add_parser('engines', help="Pages/sec and fidelity of each PDF text engine")
+    engines_parser.add_argument('--corpus', default=None,
+                                help="Directory of PDFs; NAME.txt next to NAME.pdf is its reference text")
+    engines_parser.add_argument('--engines', nargs='+', default=None)
+    engines_parser.add_argument('--repeat', type=int, default=3)
+    engines_parser.set_defaults(func=bench_engines)
+
+    docx_parser = subparsers.add_parser('docx', help="python-docx vs streaming DOCX extraction")
+    docx_parser.add_argument('--paragraphs', type=int, default=400)
+    docx_parser.add_argument('--tables', type=int, default=20)
+    docx_parser.add_argument('--rows', type=int, default=25)
+    docx_parser.add_argument('--repeat', type=int, default=5)
+    docx_parser.set_defaults(func=bench_docx)
+
+    regex_parser = subparsers.add_parser('regex', help="Per-pattern re.search vs precompiled regex bank")
+    regex_parser.add_argument('--entries', type=int, default=4)
+    regex_parser.add_argument('--iterations', type=int, default=20000)
+    regex_parser.set_defaults(func=bench_regex)
+
+    skills_parser = subparsers.add_parser('skills', help="Skill index latency as the vocabulary grows")
+    skills_parser.add_argument('--sizes', type=int, nargs='+', default=[140, 1000, 5000, 20000])
+    skills_parser.add_argument('--budget-ms', type=float, default=5.0)
+    skills_parser.add_argument('--repeat', type=int, default=5)
+    skills_parser.add_argument('--naive-limit', type=int, default=1000,
+                               help="Largest vocabulary to run the naive fuzzy scan on")
+    skills_parser.set_defaults(func=bench_skills)
+
+    spacy_parser = subparsers.add_parser('spacy', help="spaCy model load time and RSS, per instance vs shared")
+    spacy_parser.add_argument('--model', default='en_core_web_sm', help="Installed model name or path")
+    spacy_parser.add_argument('--analyzers', type=int, default=5)
+    spacy_parser.add_argument('--docs', type=int, default=50)
+    spacy_parser.add_argument('--child', choices=['per-instance', 'shared'], help=argparse.SUPPRESS)
+    spacy_parser.set_defaults(func=bench_spacy)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -62,6 +62,23 @@ def init_database():
     )
     ''')
     
+    # Create resume_analytics table (one row per resume, see resume_analytics.backfill)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS resume_analytics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        resume_id INTEGER NOT NULL UNIQUE,
+        word_count INTEGER,
+        sentence_count INTEGER,
+        skills_count INTEGER,
+        experience_years INTEGER,
+        profile_score INTEGER,
+        skills TEXT,
+        suggestions TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (resume_id) REFERENCES resume_data (id)
+    )
+    ''')
+    
     # Create admin_logs table
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS admin_logs (
@@ -154,6 +171,85 @@ def save_analysis_data(resume_id, analysis):
     finally:
         conn.close()
 
+def save_analysis_batch(resume_ids, analyses):
+    """Save columnar batch analysis output (see utils.batch_analysis) in one transaction"""
+    conn = get_database_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.executemany('''
+        INSERT INTO resume_analysis (
+            resume_id, ats_score, keyword_match_score,
+            format_score, section_score, missing_skills,
+            recommendations
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', zip(
+            resume_ids,
+            analyses['ats_score'],
+            analyses['keyword_match_score'],
+            analyses['format_score'],
+            analyses['section_score'],
+            analyses['missing_skills'],
+            analyses['recommendations']
+        ))
+        
+        conn.commit()
+    except Exception as e:
+        print(f"Error saving batch analysis data: {str(e)}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+def get_resume_texts():
+    """Get (id, summary, education, experience, projects, skills) for every stored resume"""
+    conn = get_database_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('''
+        SELECT id, summary, education, experience, projects, skills
+        FROM resume_data
+        ORDER BY id
+        ''')
+        return cursor.fetchall()
+    except Exception as e:
+        print(f"Error getting resume texts: {str(e)}")
+        return []
+    finally:
+        conn.close()
+
+def save_resume_analytics_batch(resume_ids, results):
+    """Save resume_analytics analyze_batch() results, replacing earlier ones, in one transaction"""
+    conn = get_database_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.executemany('''
+        INSERT OR REPLACE INTO resume_analytics (
+            resume_id, word_count, sentence_count, skills_count,
+            experience_years, profile_score, skills, suggestions
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (
+                resume_id,
+                result['metrics']['word_count'],
+                result['metrics']['sentence_count'],
+                result['metrics']['skills_count'],
+                result['metrics']['experience_years'],
+                result['metrics']['profile_score'],
+                ','.join(result['skills']),
+                '\n'.join(suggestion['text'] for suggestion in result['suggestions'])
+            )
+            for resume_id, result in zip(resume_ids, results)
+        ])
+        
+        conn.commit()
+    except Exception as e:
+        print(f"Error saving resume analytics: {str(e)}")
+        conn.rollback()
+    finally:
+        conn.close()
+
 def get_resume_stats():
     """Get statistics about resumes"""
     conn = get_database_connection()
@@ -0,0 +1,39 @@
+"""
+Alternative spellings and abbreviations of skills, by canonical skill name.
+Aliases match on their own, so ordinary words ("node", "torch", "unreal")
+are left out.
+"""
+
+SKILL_ALIASES = {
+    "JavaScript": ["JS", "ECMAScript", "ES6"],
+    "React": ["ReactJS", "React.js"],
+    "Angular": ["AngularJS", "Angular.js"],
+    "Vue.js": ["Vue", "VueJS"],
+    "Node.js": ["NodeJS"],
+    "Python": ["Python3", "Python 3"],
+    "C++": ["CPP"],
+    "C#": ["CSharp", "C Sharp"],
+    "Go": ["Golang"],
+    "PostgreSQL": ["Postgres", "PSQL"],
+    "MongoDB": ["Mongo"],
+    "APIs": ["API"],
+    "RESTful APIs": ["REST API", "REST APIs", "RESTful API"],
+    "Microservices": ["Microservice"],
+    "Kubernetes": ["K8s", "Kube"],
+    "CI/CD": ["CICD", "Continuous Integration", "Continuous Delivery", "Continuous Deployment"],
+    "Infrastructure as Code": ["IaC"],
+    "AWS": ["Amazon Web Services"],
+    "GCP": ["Google Cloud", "Google Cloud Platform"],
+    "Azure": ["Microsoft Azure"],
+    "Linux": ["GNU/Linux"],
+    "Machine Learning": ["ML"],
+    "Artificial Intelligence": ["AI"],
+    "Natural Language Processing": ["NLP"],
+    "Scikit-learn": ["Sklearn"],
+    "Power BI": ["PowerBI"],
+    "Excel": ["MS Excel", "Microsoft Excel"],
+    "Data Visualization": ["Data Visualisation"],
+    "UI/UX": ["UX/UI", "UX", "UI Design", "UX Design"],
+    "Unreal Engine": ["UE4", "UE5"],
+    "Penetration Testing": ["Pentesting", "Pen Testing", "Pentest"],
+}
@@ -4,6 +4,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from config.database import get_database_connection
+from utils.stage_timings import get_stage_histograms
 import io
 import uuid
 from plotly.subplots import make_subplots
@@ -429,6 +430,9 @@ class DashboardManager:
         # Render resume data section
         self.render_resume_data_section()
         
+        # Render analysis stage timings
+        self.render_stage_timings_section()
+        
         # Render admin logs section
         st.markdown("<h2 class='section-title'>Admin Activity Logs</h2>", unsafe_allow_html=True)
         
@@ -474,6 +478,31 @@ class DashboardManager:
         else:
             st.info("No admin activity logs available")
 
+    def render_stage_timings_section(self):
+        """Render p50/p95/p99 latency of each analysis stage recorded by this process"""
+        st.markdown("<h2 class='section-title'>Analysis Stage Timings</h2>", unsafe_allow_html=True)
+        
+        summaries = get_stage_histograms().summaries()
+        if not summaries:
+            st.info("No stage timings recorded yet. Set PROFILE_STAGES=1 to profile analyses.")
+            return
+        
+        df = pd.DataFrame([{
+            'Analyzer': row['source'],
+            'Stage': row['stage'],
+            'Calls': row['count'],
+            'p50 (ms)': round(row['p50'] * 1000, 2),
+            'p95 (ms)': round(row['p95'] * 1000, 2),
+            'p99 (ms)': round(row['p99'] * 1000, 2),
+            'Max (ms)': round(row['max'] * 1000, 2),
+            'Mean Input Size': round(row['mean_input_size']) if row['mean_input_size'] is not None else None
+        } for row in summaries])
+        st.dataframe(df, use_container_width=True, hide_index=True)
+        
+        if st.button("🔄 Reset Stage Timings", key="reset_stage_timings"):
+            get_stage_histograms().reset()
+            st.rerun()
+
     def export_to_excel(self):
         """Export data to Excel format"""
         query = """
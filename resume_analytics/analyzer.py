@@ -1,24 +1,237 @@
-import spacy
+import re
+import threading
+from bisect import bisect_right
 from collections import Counter
 from datetime import datetime
 
+import spacy
+from spacy.matcher import Matcher, PhraseMatcher
+from spacy.pipeline.sentencizer import Sentencizer
+from spacy.util import filter_spans
+
+from config.skill_aliases import SKILL_ALIASES
+from utils.resume_document import ResumeDocument
+from utils.section_segmenter import SECTION_KEYWORDS
+from utils.skill_matcher import job_role_skills
+
+# Common technical skills keywords
+TECH_SKILLS = [
+    "python", "java", "javascript", "react", "node.js", "sql",
+    "html", "css", "aws", "docker", "kubernetes", "git",
+    "machine learning", "ai", "data science", "analytics"
+]
+
+DEFAULT_MODEL = "en_core_web_sm"
+# The analyzer only reads tokens, like_num and sentence boundaries, so every
+# trained component is left out and a rule-based sentencizer splits sentences
+EXCLUDED_COMPONENTS = ("tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner")
+# Resume lines rarely end in punctuation, so line breaks also end a sentence
+SENTENCE_END_CHARS = Sentencizer.default_punct_chars + ["\n", "\n\n"]
+# Texts per nlp.pipe batch in analyze_batch
+DEFAULT_BATCH_SIZE = 64
+
+# Experience patterns: "5 years", "5+ years", "10-year", "5+yrs"
+YEAR_WORDS = ["year", "years", "yr", "yrs"]
+YEARS_TOKEN = r"^(\d{1,2})\+?(?:years?|yrs?)$"
+# Date ranges: "2019 - 2021", "Jan 2019 – Mar 2021", "05/2019 - present", and
+# "2015–2021", which the tokenizer keeps as one token
+YEAR_TOKEN = r"^(?:\d{1,2}/)?(?:19|20)\d{2}$"
+YEAR_RANGE_TOKEN = r"^(?:\d{1,2}/)?(?:19|20)\d{2}[-–—](?:\d{1,2}/)?(?:19|20)\d{2}$"
+RANGE_SEPARATORS = ["-", "–", "—", "to", "until", "till"]
+ONGOING_WORDS = ["present", "current", "now", "today", "date"]
+MONTHS = [
+    "jan", "january", "feb", "february", "mar", "march", "apr", "april", "may", "jun", "june",
+    "jul", "july", "aug", "august", "sep", "sept", "september", "oct", "october",
+    "nov", "november", "dec", "december"
+]
+_YEAR = re.compile(r"(?:19|20)\d{2}")
+# Date ranges on or next to a line with one of these words, or under an
+# education heading, are studies rather than experience
+EDUCATION_WORDS = [keyword for keyword in SECTION_KEYWORDS['education'] if ' ' not in keyword] + [
+    "gpa", "cgpa", "coursework", "graduated", "graduation"
+]
+# Lowercased heading line -> section name ("work experience" -> "experience")
+SECTION_HEADINGS = {keyword: name for name, keywords in SECTION_KEYWORDS.items() for keyword in keywords}
+
+_models = {}
+_profile_matchers = {}
+_models_lock = threading.Lock()
+
+
+def get_nlp(model=DEFAULT_MODEL, warm_up=False):
+    """
+    Return the process-wide trimmed pipeline for model, loading it on first
+    use. warm_up runs one short text through it so the first real call does
+    not pay for lazy initialization.
+    """
+    with _models_lock:
+        nlp = _models.get(model)
+        if nlp is None:
+            nlp = spacy.load(model, exclude=EXCLUDED_COMPONENTS)
+            if "sentencizer" not in nlp.pipe_names:
+                nlp.add_pipe("sentencizer", config={"punct_chars": SENTENCE_END_CHARS})
+            _models[model] = nlp
+    if warm_up:
+        nlp("Software engineer with 5 years of experience. Skilled in Python and SQL.")
+    return nlp
+
+
+class ProfileMatcher:
+    """
+    Skills and years of experience of a parsed resume, found by matchers
+    compiled once per pipeline. Skills (JOB_ROLES plus TECH_SKILLS, and
+    their SKILL_ALIASES) go into a PhraseMatcher on lowercase tokens, which
+    looks phrases of any length up by hash, so its cost does not grow with
+    the vocabulary. A token Matcher finds stated years ("5+ years") and date
+    ranges ("2019 – present"); ranges belonging to education entries are
+    not counted as experience.
+    """
+
+    def __init__(self, nlp, skills, aliases=None):
+        if aliases is None:
+            aliases = SKILL_ALIASES
+
+        # Lowercased skill -> name as first written; aliases of known skills map to them
+        self.names = {}
+        for skill in skills:
+            self.names.setdefault(skill.strip().lower(), skill.strip())
+        phrases = {key: [name] for key, name in self.names.items()}
+        for canonical, alternatives in aliases.items():
+            key = canonical.lower()
+            if key in phrases:
+                phrases[key].extend(alternatives)
+
+        self.skill_matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+        for key, texts in phrases.items():
+            self.skill_matcher.add(key, list(nlp.tokenizer.pipe(texts)))
+
+        year = {"TEXT": {"REGEX": YEAR_TOKEN}}
+        separator = {"LOWER": {"IN": RANGE_SEPARATORS}}
+        month = {"LOWER": {"IN": MONTHS}, "OP": "?"}
+        self.experience_matcher = Matcher(nlp.vocab)
+        self.experience_matcher.add("YEARS", [
+            [{"LIKE_NUM": True}, {"ORTH": {"IN": ["+", "-"]}, "OP": "?"}, {"LOWER": {"IN": YEAR_WORDS}}],
+            [{"LOWER": {"REGEX": YEARS_TOKEN}}]
+        ], greedy="LONGEST")
+        self.experience_matcher.add("RANGE", [
+            [year, separator, month, year],
+            [year, separator, {"LOWER": {"IN": ONGOING_WORDS}}],
+            [{"TEXT": {"REGEX": YEAR_RANGE_TOKEN}}]
+        ], greedy="LONGEST")
+        self.experience_matcher.add("EDUCATION", [[{"LOWER": {"IN": EDUCATION_WORDS}}]])
+
+    def extract(self, doc):
+        """Return (skill names, years of experience) found in doc"""
+        # Overlapping skills keep the longest ("React Native" rather than "React")
+        spans = filter_spans(self.skill_matcher(doc, as_spans=True))
+        skills = {self.names[span.label_] for span in spans}
+
+        stated_years = 0
+        ranges = []
+        education = []  # Token indexes of education words
+        this_year = datetime.now().year
+        for match_id, start, end in self.experience_matcher(doc):
+            label = doc.vocab.strings[match_id]
+            span = doc[start:end]
+            if label == "EDUCATION":
+                education.append(start)
+            elif label == "YEARS":
+                number = re.match(r"\d+", span[0].text)
+                if number:
+                    stated_years = max(stated_years, int(number.group()))
+            else:
+                years = [int(year) for year in _YEAR.findall(span.text)]
+                first, last = years[0], years[-1] if len(years) > 1 else this_year
+                if first <= last <= this_year:
+                    ranges.append((first, last, span))
+
+        if ranges:
+            headings = _section_headings(doc)
+            ranges = [(first, last) for first, last, span in ranges
+                      if not _is_education(span, education, headings)]
+        return skills, max(stated_years, _covered_years(ranges))
+
+
+def _section_headings(doc):
+    """(start token, section name) of each sentence of doc that is a section heading, in order"""
+    headings = []
+    for sent in doc.sents:
+        name = SECTION_HEADINGS.get(sent.text.strip().rstrip(':').strip().lower())
+        if name:
+            headings.append((sent.start, name))
+    return headings
+
+
+def _is_education(span, education, headings):
+    """
+    Whether a date range belongs to an education entry: an education word
+    is on its line or the line before, or it sits under an education heading
+    """
+    sent = span.sent
+    first = span.doc[sent.start - 1].sent.start if sent.start else 0
+    if any(first <= index < sent.end for index in education):
+        return True
+    heading = bisect_right([start for start, _ in headings], span.start) - 1
+    return heading >= 0 and headings[heading][1] == 'education'
+
+
+def _covered_years(ranges):
+    """Years covered by the union of (first year, last year) ranges"""
+    covered = 0
+    current_start = current_end = None
+    for first, last in sorted(ranges):
+        if current_end is None or first > current_end:
+            if current_end is not None:
+                covered += current_end - current_start
+            current_start, current_end = first, last
+        else:
+            current_end = max(current_end, last)
+    if current_end is not None:
+        covered += current_end - current_start
+    return covered
+
+
+def get_profile_matcher(model=DEFAULT_MODEL):
+    """Return the process-wide ProfileMatcher for model's pipeline"""
+    nlp = get_nlp(model)
+    with _models_lock:
+        matcher = _profile_matchers.get(model)
+        if matcher is None:
+            matcher = _profile_matchers[model] = ProfileMatcher(nlp, job_role_skills() + TECH_SKILLS)
+        return matcher
+
+
 class ResumeAnalyzer:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
+    def __init__(self, model=DEFAULT_MODEL, warm_up=False):
+        # Shared by every analyzer in the process (see get_nlp)
+        self.nlp = get_nlp(model, warm_up)
+        # Skill and experience matchers compiled once per pipeline (see ProfileMatcher)
+        self.profile_matcher = get_profile_matcher(model)
         
     def analyze_resume(self, resume_text):
-        """Analyze resume text and return metrics"""
-        doc = self.nlp(resume_text)
-        
+        """Analyze resume text (or its ResumeDocument) and return metrics"""
+        document = ResumeDocument.of(resume_text)
+        return self._analyze_doc(document, self.nlp(document.text))
+    
+    def analyze_batch(self, texts, batch_size=DEFAULT_BATCH_SIZE, n_process=1):
+        """
+        Analyze many resume texts (or ResumeDocuments) with nlp.pipe and
+        return one analyze_resume() result per text, in input order.
+        n_process > 1 tokenizes in that many worker processes.
+        """
+        documents = [ResumeDocument.of(text) for text in texts]
+        docs = self.nlp.pipe((document.text for document in documents),
+                             batch_size=batch_size, n_process=n_process)
+        return [self._analyze_doc(document, doc) for document, doc in zip(documents, docs)]
+    
+    def _analyze_doc(self, document, doc):
+        """Metrics, skills and suggestions for one resume and its parsed Doc"""
         # Basic metrics
-        word_count = len(resume_text.split())
+        word_count = len(document.words)
         sentence_count = len(list(doc.sents))
         
-        # Skills extraction
-        skills = self._extract_skills(doc)
-        
-        # Experience analysis
-        experience_years = self._analyze_experience(doc)
+        # Skills and experience, in one pass of the matchers
+        skills, experience_years = self.profile_matcher.extract(doc)
         
         # Calculate profile score
         profile_score = self._calculate_profile_score(
@@ -40,41 +253,6 @@ class ResumeAnalyzer:
             )
         }
     
-    def _extract_skills(self, doc):
-        """Extract skills from resume"""
-        # Common technical skills keywords
-        tech_skills = {
-            "python", "java", "javascript", "react", "node.js", "sql",
-            "html", "css", "aws", "docker", "kubernetes", "git",
-            "machine learning", "ai", "data science", "analytics"
-        }
-        
-        skills = set()
-        for token in doc:
-            if token.text.lower() in tech_skills:
-                skills.add(token.text)
-            # Check for compound skills (e.g., "machine learning")
-            if token.i < len(doc) - 1:
-                bigram = (token.text + " " + doc[token.i + 1].text).lower()
-                if bigram in tech_skills:
-                    skills.add(bigram)
-        
-        return skills
-    
-    def _analyze_experience(self, doc):
-        """Analyze years of experience"""
-        # Simple heuristic - look for number + "years"
-        experience_years = 0
-        for token in doc:
-            if token.like_num and token.i < len(doc) - 1:
-                next_token = doc[token.i + 1]
-                if "year" in next_token.text.lower():
-                    try:
-                        experience_years = max(experience_years, int(token.text))
-                    except ValueError:
-                        continue
-        return experience_years
-    
     def _calculate_profile_score(self, word_count, sentence_count, skills_count, experience_years):
         """Calculate profile score based on various metrics"""
         score = 0
@@ -0,0 +1,82 @@
+"""
+Recompute resume_analytics for every stored resume.
+
+resume_data keeps the builder's fields rather than the raw resume, so each
+row's text is rebuilt from its summary, education, experience, projects and
+skills. Rows are read once, analyzed chunk by chunk with
+ResumeAnalyzer.analyze_batch (nlp.pipe, optionally over several processes)
+and each chunk is written to the resume_analytics table in one transaction,
+replacing earlier results.
+
+Usage:
+    python -m resume_analytics.backfill [--batch-size 64] [--n-process 1] [--chunk 1000] [--model en_core_web_sm]
+"""
+
+import argparse
+import ast
+import time
+
+from config.database import init_database, get_resume_texts, save_resume_analytics_batch
+from resume_analytics.analyzer import DEFAULT_BATCH_SIZE, DEFAULT_MODEL, ResumeAnalyzer
+
+# Resumes analyzed and saved per transaction
+DEFAULT_CHUNK = 1000
+
+
+def _text_values(value):
+    """Every string inside a stored field (lists and dicts are flattened in order)"""
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple, set)):
+        return [text for item in value for text in _text_values(item)]
+    return [str(value)] if value is not None else []
+
+
+def resume_text(fields):
+    """Resume text rebuilt from stored fields, saved by save_resume_data as str() of lists"""
+    lines = []
+    for field in fields:
+        if not field:
+            continue
+        try:
+            value = ast.literal_eval(field)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            value = field
+        lines.extend(_text_values(value))
+    return '\n'.join(lines)
+
+
+def backfill(model=DEFAULT_MODEL, batch_size=DEFAULT_BATCH_SIZE, n_process=1, chunk=DEFAULT_CHUNK):
+    """Analyze every resume_data row and save the results; returns the number of resumes"""
+    init_database()
+    rows = get_resume_texts()
+    analyzer = ResumeAnalyzer(model)
+
+    start = time.perf_counter()
+    for offset in range(0, len(rows), chunk):
+        part = rows[offset:offset + chunk]
+        results = analyzer.analyze_batch([resume_text(row[1:]) for row in part],
+                                         batch_size=batch_size, n_process=n_process)
+        save_resume_analytics_batch([row[0] for row in part], results)
+        done = offset + len(part)
+        print(f"{done}/{len(rows)} resumes analyzed ({done / (time.perf_counter() - start):.1f}/s)")
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute analytics for every stored resume")
+    parser.add_argument('--model', default=DEFAULT_MODEL, help="Installed spaCy model name or path")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--n-process', type=int, default=1, help="Processes used by nlp.pipe")
+    parser.add_argument('--chunk', type=int, default=DEFAULT_CHUNK, help="Resumes saved per transaction")
+    args = parser.parse_args()
+
+    total = backfill(args.model, args.batch_size, args.n_process, args.chunk)
+    if not total:
+        print("No resumes in resume_data")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,70 @@ import streamlit as st
 from dotenv import load_dotenv
 import google.generativeai as genai
 import pdfplumber
-from pdf2image import convert_from_path
-import pytesseract
-import tempfile
+import io
 import requests
 import json
 import math
 import re
+import time
+import asyncio
+
+from .docx_extraction import extract_docx_text
+from .extraction_cache import content_hash, get_extraction_cache, make_cache_key, read_upload_bytes
+from .llm_cache import get_llm_cache, llm_cache_key
+from .llm_client import (
+    DEFAULT_CONCURRENCY, DEFAULT_MAX_RETRIES, DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_TIMEOUT, LLMClient
+)
+from .ocr_backends import DEFAULT_OCR_BACKEND, get_ocr_backend
+from .pdf_extraction import DEFAULT_MIN_QUALITY, ExtractionScheduler, PageText, iter_engine_pages
+from .pdf_ocr import (
+    DEFAULT_OCR_MEMORY_CEILING, MIN_TEXT_LAYER_CHARS, default_ocr_workers, get_page_count, image_coverage,
+    ocr_pages, page_needs_ocr
+)
+from .preflight import DEFAULT_PREFLIGHT_BUDGETS, inspect_upload
+from .resume_document import ResumeDocument
+from .stage_timings import DEFAULT_PROFILE_STAGES, StageTimer
 
 
 class AIResumeAnalyzer:
-    def __init__(self):
+    # Bump when extraction output changes so cached text is invalidated
+    PDF_EXTRACTOR_VERSION = 6
+    DOCX_EXTRACTOR_VERSION = 2
+    GEMINI_MODEL = "gemini-2.5-flash"
+    # Bump when the analysis prompt changes so cached responses are invalidated
+    ANALYSIS_PROMPT_VERSION = 1
+
+    # Per-document latency budget of each extraction engine, in seconds
+    DEFAULT_EXTRACTION_BUDGETS = {'pypdf': 10, 'PyPDF2': 10, 'pdfium': 10, 'pdfplumber': 20, 'ocr': 180}
+
+    def __init__(self, ocr_workers=None, extraction_budgets=None, extraction_min_quality=DEFAULT_MIN_QUALITY,
+                 ocr_memory_ceiling=DEFAULT_OCR_MEMORY_CEILING, ocr_backend=DEFAULT_OCR_BACKEND,
+                 preflight_budgets=None, text_engine='pypdf', profile_stages=DEFAULT_PROFILE_STAGES,
+                 llm_cache=True):
+        # Size of the OCR process pool (None = one worker per core, 1 = serial)
+        self.ocr_workers = ocr_workers
+        # 'tesserocr' (warm in-process engine), 'pytesseract' (subprocess per page) or 'auto'
+        self.ocr_backend = ocr_backend
+        # Upper bound on page bitmap memory across all OCR workers, in bytes
+        self.ocr_memory_ceiling = ocr_memory_ceiling
+        
+        # First (cheapest) engine of the cascade, from pdf_extraction.PDF_TEXT_ENGINES
+        self.text_engine = text_engine
+        
+        # Extraction escalates to the next engine only below this quality
+        self.extraction_budgets = {**self.DEFAULT_EXTRACTION_BUDGETS, **(extraction_budgets or {})}
+        self.extraction_min_quality = extraction_min_quality
+        self.last_extraction_report = None
+        
+        # Upload limits checked before extraction (see utils.preflight)
+        self.preflight_budgets = {**DEFAULT_PREFLIGHT_BUDGETS, **(preflight_budgets or {})}
+        
+        # Record per-stage timings (see utils.stage_timings)
+        self.profile_stages = profile_stages
+        
+        # Reuse model responses for identical requests (see utils.llm_cache)
+        self.llm_cache = get_llm_cache() if llm_cache else None
+        
         # Load environment variables
         load_dotenv()
         
@@ -25,174 +78,375 @@ class AIResumeAnalyzer:
             genai.configure(api_key=self.google_api_key)
     
     def extract_text_from_pdf(self, pdf_file):
-        """Extract text from PDF using pdfplumber and OCR if needed"""
-        text = ""
+        """Extract text from PDF using pypdf, pdfplumber and OCR if needed"""
+        report = self.extract_pdf_with_report(pdf_file)
+        if not report['text'] and not report['preflight']['rejected']:
+            st.error("All text extraction methods failed. Please try a different PDF or manually extract the text.")
+        return report['text']
+
+    def extract_pdf_with_report(self, pdf_file):
+        """
+        Extract text from a PDF and report how it was obtained:
+        {'text', 'engine', 'quality', 'ocr_pages', 'attempts'} where attempts
+        lists every engine tried with its status, duration in seconds and
+        quality score, and ocr_pages the image-only pages left without text.
+        It also includes peak_rss_bytes (largest RSS measured while OCR'ing
+        pages for this call, in this process or a worker) and
+        peak_raster_bytes (largest OCR page bitmap); both are 0 when no page
+        was OCR'd, e.g. on a cache hit. Then comes the preflight report of
+        the upload. A rejected
+        upload yields empty text without running any engine. The last report
+        is also kept on self.last_extraction_report.
+        """
+        timer = self.stage_timer()
+        file_content = read_upload_bytes(pdf_file)
+        preflight = self.preflight(file_content)
+        memory = {}
+        if preflight['rejected']:
+            report = {'text': "", 'engine': None, 'quality': 0.0, 'ocr_pages': [], 'attempts': []}
+        else:
+            # Only the first pages_analyzed pages are extracted
+            max_pages = preflight['pages_analyzed']
+            report = get_extraction_cache().get_or_extract(
+                file_content, 'AIResumeAnalyzer.pdf', self.PDF_EXTRACTOR_VERSION,
+                lambda content: self._extract_pdf_report(content, max_pages, memory),
+                cacheable=self._report_cacheable, parts=(self.text_engine, max_pages)
+            )
+        # Per-call figures are added to a copy, never to the cached report
+        report = dict(report)
+        report['peak_rss_bytes'] = memory.get('peak_rss_bytes', 0)
+        report['peak_raster_bytes'] = memory.get('peak_raster_bytes', 0)
+        report['preflight'] = preflight
+        self.last_extraction_report = report
+        timer.lap('extraction', len(file_content))
+        return report
+
+    def _report_cacheable(self, report):
+        """
+        Only keep reports that a retry could not improve: every engine that
+        ran finished (or the text is good enough regardless) and no
+        image-only page was left without OCR text. Budget overruns, engine
+        errors and a missing OCR backend are transient.
+        """
+        if not report['text'] or report['ocr_pages']:
+            return False
+        return (all(attempt['status'] == 'ok' for attempt in report['attempts'])
+                or report['quality'] >= self.extraction_min_quality)
+    
+    def stage_timer(self):
+        """StageTimer for one call; does nothing unless self.profile_stages is set"""
+        return StageTimer('AIResumeAnalyzer', self.profile_stages)
+
+    def preflight(self, file_content):
+        """
+        Inspect upload bytes against self.preflight_budgets and tell the user
+        if the upload is rejected or will be truncated. Returns the report.
+        """
+        report = inspect_upload(file_content, self.preflight_budgets)
+        if report['rejected']:
+            st.error(f"Upload rejected: {report['rejected']}")
+        elif report['truncated']:
+            st.warning(f"This document has {report['page_count']} pages; only the first "
+                       f"{report['pages_analyzed']} will be analyzed.")
+        return report
+
+    @staticmethod
+    def _notify(notices, kind, *args):
+        """Show a Streamlit message (st.<kind>), or queue it on notices when called from an engine thread"""
+        if notices is None:
+            getattr(st, kind)(*args)
+        else:
+            notices.append((kind, args))
+    
+    def _extract_pdf_report(self, file_content, max_pages=None, memory=None):
+        """
+        Run the cheapest-first extraction cascade on PDF bytes (uncached).
+        The OCR memory peaks of this run are moved out of the report into
+        memory, since they describe this call rather than the document.
+        """
+        digest = content_hash(file_content)
+        # Engine threads queue their messages here; they are shown once the
+        # cascade is over, so an engine abandoned after its budget never
+        # touches Streamlit after this script run has moved on
+        notices = []
+        budgets = self.extraction_budgets
+        engines = []
+        if self.text_engine != 'pdfplumber':
+            engines.append((self.text_engine,
+                            lambda content, previous: self._engine_text_layer(content, previous, max_pages),
+                            budgets.get(self.text_engine, budgets['pypdf'])))
+        engines += [
+            ('pdfplumber', lambda content, previous: self._engine_pdfplumber(content, previous, max_pages, notices),
+             budgets['pdfplumber']),
+            ('ocr', lambda content, previous: self._engine_ocr(content, previous, digest, max_pages, notices),
+             budgets['ocr'])
+        ]
+        engine_budgets = {name: budget for name, _, budget in engines}
+        scheduler = ExtractionScheduler(engines, min_quality=self.extraction_min_quality)
+        # A rerun on the same document joins engines still running from an
+        # earlier run instead of starting them again
+        report = scheduler.run(file_content, key=(digest, self.PDF_EXTRACTOR_VERSION, self.text_engine, max_pages))
+        report['text'] = report['text'].strip()
+        for kind, args in list(notices):
+            getattr(st, kind)(*args)
         
-        # Save the uploaded file to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            if hasattr(pdf_file, 'getbuffer'):
-                temp_file.write(pdf_file.getbuffer())
-            elif hasattr(pdf_file, 'read'):
-                temp_file.write(pdf_file.read())
-                pdf_file.seek(0)  # Reset file pointer
-            else:
-                # If it's already bytes
-                temp_file.write(pdf_file)
-            temp_path = temp_file.name
+        if memory is not None:
+            for attempt in report['attempts']:
+                for name in ('peak_rss_bytes', 'peak_raster_bytes'):
+                    if name in attempt.get('stats', {}):
+                        memory[name] = max(memory.get(name, 0), attempt['stats'].pop(name))
+        
+        for attempt in report['attempts']:
+            if attempt['status'] == 'timeout':
+                st.warning(f"{attempt['engine']} extraction exceeded its {engine_budgets[attempt['engine']]}s budget and was skipped.")
+            elif attempt['status'] == 'error':
+                st.warning(f"{attempt['engine']} extraction failed: {attempt['error']}")
+        return report
+    
+    def _engine_text_layer(self, file_content, previous, max_pages=None):
+        """
+        Cheapest engine: the text layer read by self.text_engine (pypdf by
+        default). Pages without text, and short pages mostly covered by
+        images, are flagged for OCR.
+        """
+        page_texts = [page.text for page in iter_engine_pages(file_content, self.text_engine, max_pages)]
+        # Only short pages can be image-only, so only they are measured
+        short_pages = [page_number for page_number, page_text in enumerate(page_texts, start=1)
+                       if 0 < len(page_text.strip()) < MIN_TEXT_LAYER_CHARS]
+        coverage = {}
+        if short_pages:
+            with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+                for page_number in short_pages:
+                    coverage[page_number] = image_coverage(pdf.pages[page_number - 1])
+        return {
+            'text': "\n".join(page_texts),
+            'page_texts': page_texts,
+            'ocr_pages': [page_number for page_number, page_text in enumerate(page_texts, start=1)
+                          if page_needs_ocr(len(page_text.strip()), coverage.get(page_number, 0.0))]
+        }
+    
+    def _engine_pdfplumber(self, file_content, previous, max_pages=None, notices=None):
+        """
+        pdfplumber text layer, which handles layouts better than pypdf. Also
+        flags the pages that have no usable text layer and need OCR.
+        """
+        import warnings
+        
+        page_texts = []
+        ocr_page_numbers = []
+        # BytesIO shares the upload's buffer, so no copy or temp file is made
+        with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+            for page_number, page in enumerate(pdf.pages[:max_pages], start=1):
+                page_text = ""
+                try:
+                    # Suppress specific warnings about PDFColorSpace conversion
+                    with warnings.catch_warnings():
+                        warnings.filterwarnings("ignore", message=".*PDFColorSpace.*")
+                        warnings.filterwarnings("ignore", message=".*Cannot convert.*")
+                        page_text = page.extract_text() or ""
+                        if page_needs_ocr(len(page.chars), image_coverage(page)):
+                            ocr_page_numbers.append(page_number)
+                except Exception as e:
+                    # Don't show these specific errors to the user
+                    if "PDFColorSpace" not in str(e) and "Cannot convert" not in str(e):
+                        self._notify(notices, 'warning', f"Error extracting text from page with pdfplumber: {e}")
+                    ocr_page_numbers.append(page_number)
+                page_texts.append(page_text)
+        
+        return {
+            'text': "\n".join(page_text for page_text in page_texts if page_text),
+            'page_texts': page_texts,
+            'ocr_pages': ocr_page_numbers
+        }
+    
+    def _engine_ocr(self, file_content, previous, digest, max_pages=None, notices=None):
+        """
+        Most expensive engine: OCR the image-only pages and merge them with
+        the best text layer found so far. Native text is kept; OCR text is
+        only added to it. When no text layer could be read, every page is
+        OCR'd. Pages OCR could not be run on are returned as 'ocr_pages'.
+        """
+        if 'pdfplumber' in previous:
+            page_texts = list(previous['pdfplumber']['page_texts'])
+            ocr_page_numbers = previous['pdfplumber']['ocr_pages']
+        elif self.text_engine in previous:
+            page_texts = list(previous[self.text_engine]['page_texts'])
+            ocr_page_numbers = previous[self.text_engine]['ocr_pages']
+        else:
+            page_texts, ocr_page_numbers = None, None
+        
+        if page_texts is not None and not ocr_page_numbers:
+            # Every page has a text layer: nothing for OCR to add
+            return {'text': "\n".join(page_text for page_text in page_texts if page_text),
+                    'page_texts': page_texts, 'ocr_pages': []}
+        if page_texts is None or len(ocr_page_numbers) == len(page_texts):
+            self._notify(notices, 'warning', "Standard text extraction methods failed. Your PDF might be image-based or scanned.")
+        if ocr_page_numbers is None and max_pages is not None:
+            ocr_page_numbers = list(range(1, min(get_page_count(file_content), max_pages) + 1))
+        
+        stats = {}
+        ocr_results = self._ocr_pdf_pages(file_content, digest, ocr_page_numbers, stats, notices)
+        if page_texts is None:
+            page_texts = [""] * max(ocr_results, default=0)
+        for page_number, page_text in ocr_results.items():
+            native_text = page_texts[page_number - 1]
+            page_texts[page_number - 1] = f"{native_text}\n{page_text}" if native_text.strip() else page_text
+        
+        if ocr_page_numbers and not any(ocr_results.get(page_number, "").strip() for page_number in ocr_page_numbers):
+            self._notify(notices, 'error', "OCR extraction yielded no text. Please check if the PDF contains actual text content.")
+        
+        # Pages still lacking text because OCR failed, so the report is not cached
+        missing_pages = []
+        if 'error' in stats:
+            missing_pages = [page_number for page_number in ocr_page_numbers or [] if page_number not in ocr_results]
+        
+        return {
+            'text': "\n".join(page_text for page_text in page_texts if page_text),
+            'page_texts': page_texts,
+            'ocr_pages': missing_pages,
+            'stats': stats
+        }
+    
+    def iter_pages(self, pdf_file):
+        """
+        Yield a PageText for each page as soon as it is ready: the text layer
+        where one exists, OCR (one page at a time) for image-only pages.
+        Nothing is yielded for an upload rejected by preflight().
+        """
+        import warnings
+        
+        file_content = read_upload_bytes(pdf_file)
+        preflight = self.preflight(file_content)
+        if preflight['rejected']:
+            return
+        digest = content_hash(file_content)
+        with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+            for page_number, page in enumerate(pdf.pages[:preflight['pages_analyzed']], start=1):
+                start = time.perf_counter()
+                with warnings.catch_warnings():
+                    warnings.filterwarnings("ignore", message=".*PDFColorSpace.*")
+                    warnings.filterwarnings("ignore", message=".*Cannot convert.*")
+                    page_text = page.extract_text() or ""
+                    needs_ocr = page_needs_ocr(len(page.chars), image_coverage(page))
+                engine = 'pdfplumber'
+                if needs_ocr:
+                    ocr_results = self._ocr_pdf_pages(file_content, digest, [page_number])
+                    if page_number in ocr_results:
+                        page_text, engine = ocr_results[page_number], 'tesseract'
+                yield PageText(page_number, page_text, engine, time.perf_counter() - start)
+    
+    def _find_poppler_path(self, notices=None):
+        """Locate Poppler on Windows; elsewhere it is expected on PATH"""
+        if os.name != 'nt':
+            return None
+        
+        # Try to find poppler in common locations
+        possible_paths = [
+            r'C:\poppler\Library\bin',
+            r'C:\Program Files\poppler\bin',
+            r'C:\Program Files (x86)\poppler\bin',
+            r'C:\poppler\bin'
+        ]
+        for path in possible_paths:
+            if os.path.exists(path):
+                self._notify(notices, 'success', f"Found Poppler at: {path}")
+                return path
+        
+        self._notify(notices, 'warning', "Poppler not found in common locations. Using default path: C:\\poppler\\Library\\bin")
+        return r'C:\poppler\Library\bin'
+    
+    def _ocr_pdf_pages(self, file_content, digest, page_numbers=None, stats=None, notices=None):
+        """
+        OCR the given 1-based pages (all pages if None) and return
+        {page_number: text}. Each page's OCR text is cached individually.
+        Rasterization stats (DPI, peak raster and RSS bytes) go into stats,
+        and stats['error'] is set when OCR could not run. Messages are
+        queued on notices when given (see _notify).
+        """
+        cache = get_extraction_cache()
+        results = {}
         
         try:
-            # Try direct text extraction with pdfplumber
-            try:
-                with pdfplumber.open(temp_path) as pdf:
-                    for page in pdf.pages:
-                        try:
-                            # Suppress specific warnings about PDFColorSpace conversion
-                            import warnings
-                            with warnings.catch_warnings():
-                                warnings.filterwarnings("ignore", message=".*PDFColorSpace.*")
-                                warnings.filterwarnings("ignore", message=".*Cannot convert.*")
-                                page_text = page.extract_text()
-                                if page_text:
-                                    text += page_text + "\n"
-                        except Exception as e:
-                            # Don't show these specific errors to the user
-                            if "PDFColorSpace" not in str(e) and "Cannot convert" not in str(e):
-                                st.warning(f"Error extracting text from page with pdfplumber: {e}")
-            except Exception as e:
-                st.warning(f"pdfplumber extraction failed: {e}")
-            
-            # If pdfplumber extraction worked, return the text
-            if text.strip():
-                os.unlink(temp_path)  # Clean up the temp file
-                return text.strip()
+            # Check that an OCR backend can be started before rasterizing anything
+            get_ocr_backend(self.ocr_backend)
+            
+            poppler_path = self._find_poppler_path(notices)
+            if page_numbers is None:
+                page_numbers = range(1, get_page_count(file_content) + 1)
+            
+            pending = []
+            for page_number in page_numbers:
+                key = make_cache_key(digest, 'AIResumeAnalyzer.ocr_page', self.PDF_EXTRACTOR_VERSION, page_number)
+                cached = cache.get(key)
+                if cached is not None:
+                    results[page_number] = cached
+                else:
+                    pending.append(page_number)
             
-            # Try PyPDF2 as a fallback
-            st.info("Trying PyPDF2 extraction method...")
-            try:
-                import pypdf
-                pdf_text = ""
-                with open(temp_path, 'rb') as file:
-                    pdf_reader = pypdf.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            pdf_text += page_text + "\n"
-                
-                if pdf_text.strip():
-                    os.unlink(temp_path)  # Clean up the temp file
-                    return pdf_text.strip()
-            except Exception as e:
-                st.warning(f"PyPDF2 extraction failed: {e}")
+            if not pending:
+                return results
             
-            # If we got here, both extraction methods failed
-            st.warning("Standard text extraction methods failed. Your PDF might be image-based or scanned.")
+            workers = min(self.ocr_workers or default_ocr_workers(), len(pending))
+            self._notify(notices, 'info', f"Attempting OCR on {len(pending)} image-based page(s) using {workers} worker(s). This may take a moment...")
             
-            # Try OCR as a last resort
+            # Convert and OCR page ranges in parallel worker processes
             try:
-                # Check if we can import the required OCR libraries
-                import pytesseract
-                from pdf2image import convert_from_path
-                
-                st.info("Attempting OCR for image-based PDF. This may take a moment...")
-                
-                # Check if poppler is installed
-                poppler_path = None
-                if os.name == 'nt':  # Windows
-                    # Try to find poppler in common locations
-                    possible_paths = [
-                        r'C:\poppler\Library\bin',
-                        r'C:\Program Files\poppler\bin',
-                        r'C:\Program Files (x86)\poppler\bin',
-                        r'C:\poppler\bin'
-                    ]
-                    for path in possible_paths:
-                        if os.path.exists(path):
-                            poppler_path = path
-                            st.success(f"Found Poppler at: {path}")
-                            break
-                    
-                    if not poppler_path:
-                        st.warning("Poppler not found in common locations. Using default path: C:\\poppler\\Library\\bin")
-                        poppler_path = r'C:\poppler\Library\bin'
-                
-                # Try to convert PDF to images
-                try:
-                    if poppler_path and os.name == 'nt':
-                        images = convert_from_path(temp_path, poppler_path=poppler_path)
-                    else:
-                        images = convert_from_path(temp_path)
-                    
-                    # Process each image with OCR
-                    ocr_text = ""
-                    for i, image in enumerate(images):
-                        st.info(f"Processing page {i+1} with OCR...")
-                        page_text = pytesseract.image_to_string(image)
-                        ocr_text += page_text + "\n"
-                    
-                    if ocr_text.strip():
-                        os.unlink(temp_path)  # Clean up the temp file
-                        return ocr_text.strip()
-                    else:
-                        st.error("OCR extraction yielded no text. Please check if the PDF contains actual text content.")
-                except Exception as e:
-                    st.error(f"PDF to image conversion failed: {e}")
-                    st.info("If you're on Windows, make sure Poppler is installed and in your PATH.")
-                    st.info("Download Poppler from: https://github.com/oschwartz10612/poppler-windows/releases/")
-            except ImportError as e:
-                st.error(f"OCR libraries not available: {e}")
-                st.info("Please install the required OCR libraries:")
-                st.code("pip install pytesseract pdf2image")
-                st.info("For Windows, also download and install:")
-                st.info("1. Tesseract OCR: https://github.com/UB-Mannheim/tesseract/wiki")
-                st.info("2. Poppler: https://github.com/oschwartz10612/poppler-windows/releases/")
+                for page_number, page_text in ocr_pages(file_content, pending, poppler_path=poppler_path,
+                                                        max_workers=workers,
+                                                        memory_ceiling=self.ocr_memory_ceiling,
+                                                        stats=stats, ocr_backend=self.ocr_backend).items():
+                    results[page_number] = page_text
+                    if page_text.strip():
+                        cache.put(make_cache_key(digest, 'AIResumeAnalyzer.ocr_page',
+                                                 self.PDF_EXTRACTOR_VERSION, page_number), page_text)
             except Exception as e:
-                st.error(f"OCR processing failed: {e}")
-        
+                if stats is not None:
+                    stats['error'] = str(e)
+                self._notify(notices, 'error', f"PDF to image conversion failed: {e}")
+                self._notify(notices, 'info', "If you're on Windows, make sure Poppler is installed and in your PATH.")
+                self._notify(notices, 'info', "Download Poppler from: https://github.com/oschwartz10612/poppler-windows/releases/")
+        except ImportError as e:
+            if stats is not None:
+                stats['error'] = str(e)
+            self._notify(notices, 'error', f"OCR libraries not available: {e}")
+            self._notify(notices, 'info', "Please install the required OCR libraries:")
+            self._notify(notices, 'code', "pip install pytesseract pdf2image")
+            self._notify(notices, 'info', "For faster OCR, also install the in-process engine: pip install tesserocr")
+            self._notify(notices, 'info', "For Windows, also download and install:")
+            self._notify(notices, 'info', "1. Tesseract OCR: https://github.com/UB-Mannheim/tesseract/wiki")
+            self._notify(notices, 'info', "2. Poppler: https://github.com/oschwartz10612/poppler-windows/releases/")
         except Exception as e:
-            st.error(f"PDF processing failed: {e}")
+            if stats is not None:
+                stats['error'] = str(e)
+            self._notify(notices, 'error', f"OCR processing failed: {e}")
         
-        # Clean up the temp file
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
-        
-        # If all extraction methods failed, return an empty string
-        st.error("All text extraction methods failed. Please try a different PDF or manually extract the text.")
-        return ""
+        return results
     
     def extract_text_from_docx(self, docx_file):
         """Extract text from DOCX file"""
-        from docx import Document
-        
-        # Save the uploaded file to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
-            temp_file.write(docx_file.getbuffer())
-            temp_path = temp_file.name
-        
+        timer = self.stage_timer()
+        file_content = read_upload_bytes(docx_file)
+        if self.preflight(file_content)['rejected']:
+            return ""
+        text = get_extraction_cache().get_or_extract(
+            file_content, 'AIResumeAnalyzer.docx', self.DOCX_EXTRACTOR_VERSION, self._extract_docx_text
+        )
+        timer.lap('extraction', len(file_content))
+        return text
+
+    def _extract_docx_text(self, file_content):
+        """Extract text (paragraphs and tables) from DOCX bytes by streaming document.xml (uncached)"""
         text = ""
         try:
-            doc = Document(temp_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
+            text = extract_docx_text(file_content)
         except Exception as e:
             st.error(f"Error extracting text from DOCX: {e}")
         
-        os.unlink(temp_path)  # Clean up the temp file
         return text
     
-    def analyze_resume_with_gemini(self, resume_text, job_description=None, job_role=None):
-        """Analyze resume using Google Gemini AI"""
-        if not resume_text:
-            return {"error": "Resume text is required for analysis."}
-        
-        if not self.google_api_key:
-            return {"error": "Google API key is not configured. Please add it to your .env file."}
-        
-        try:
-            model = genai.GenerativeModel("gemini-2.5-flash")
-            
-            base_prompt = f"""
+    def _analysis_prompt(self, document, job_description=None, job_role=None):
+        """Resume analysis prompt for a ResumeDocument (bump ANALYSIS_PROMPT_VERSION when changing it)"""
+        base_prompt = f"""
             You are an expert resume analyst with deep knowledge of industry standards, job requirements, and hiring practices across various fields. Your task is to provide a comprehensive, detailed analysis of the resume provided.
             
             Please structure your response in the following format:
@@ -230,20 +484,20 @@ class AIResumeAnalyzer:
             [Provide a score from 0-100 based on the overall quality of the resume. Use this format exactly: "Resume Score: XX/100" where XX is the numerical score. Be consistent with your assessment - a resume with significant issues should score below 60, an average resume 60-75, a good resume 75-85, and an excellent resume 85-100.]
             
             Resume:
-            {resume_text}
+            {document.normalized_text}
             """
-            
-            if job_role:
-                base_prompt += f"""
+        
+        if job_role:
+            base_prompt += f"""
                 
                 The candidate is targeting a role as: {job_role}
                 
                 ## Role Alignment Analysis
                 [Analyze how well the resume aligns with the target role of {job_role}. Provide specific recommendations to better align the resume with this role.]
                 """
-            
-            if job_description:
-                base_prompt += f"""
+        
+        if job_description:
+            base_prompt += f"""
                 
                 Additionally, compare this resume to the following job description:
                 
@@ -256,24 +510,115 @@ class AIResumeAnalyzer:
                 ## Key Job Requirements Not Met
                 [List specific requirements from the job description that are not addressed in the resume, with recommendations on how to address each gap]
                 """
+        
+        return base_prompt
+    
+    def _analysis_result(self, response_text):
+        """{analysis, resume_score, ats_score} from a model's response to the analysis prompt"""
+        analysis = response_text.strip()
+        
+        # Extract resume score if present
+        resume_score = self._extract_score_from_text(analysis)
+        
+        # Extract ATS score if present
+        ats_score = self._extract_ats_score_from_text(analysis)
+        
+        return {
+            "analysis": analysis,
+            "resume_score": resume_score,
+            "ats_score": ats_score
+        }
+    
+    def analyze_resume_with_gemini(self, resume_text, job_description=None, job_role=None, bypass_cache=False):
+        """
+        Analyze resume (text or a ResumeDocument) using Google Gemini AI.
+        Identical requests are answered from the response cache unless
+        bypass_cache is set, which fetches and stores a fresh response.
+        """
+        document = ResumeDocument.of(resume_text)
+        if not document.normalized_text:
+            return {"error": "Resume text is required for analysis."}
+        
+        if not self.google_api_key:
+            return {"error": "Google API key is not configured. Please add it to your .env file."}
+        
+        cache_key = llm_cache_key(document.normalized_text, job_role, job_description,
+                                  self.GEMINI_MODEL, self.ANALYSIS_PROMPT_VERSION)
+        if self.llm_cache is not None:
+            cached = self.llm_cache.get(cache_key, bypass=bypass_cache)
+            if cached is not None:
+                return {**cached, "cached": True}
+        
+        try:
+            model = genai.GenerativeModel(self.GEMINI_MODEL)
             
-            response = model.generate_content(base_prompt)
-            analysis = response.text.strip()
-            
-            # Extract resume score if present
-            resume_score = self._extract_score_from_text(analysis)
-            
-            # Extract ATS score if present
-            ats_score = self._extract_ats_score_from_text(analysis)
+            base_prompt = self._analysis_prompt(document, job_description, job_role)
             
-            return {
-                "analysis": analysis,
-                "resume_score": resume_score,
-                "ats_score": ats_score
-            }
+            response = model.generate_content(base_prompt)
+            result = self._analysis_result(response.text)
+            if self.llm_cache is not None:
+                self.llm_cache.put(cache_key, result, self.GEMINI_MODEL)
+            return result
         
         except Exception as e:
             return {"error": f"Analysis failed: {str(e)}"}
+    
+    def llm_client(self, provider='gemini', **options):
+        """
+        Async LLMClient for provider ('gemini' or 'openrouter') with this
+        analyzer's API key; options are LLMClient limits (concurrency,
+        requests_per_minute, timeout, max_retries, base_url, model, ...)
+        """
+        api_key = self.google_api_key if provider == 'gemini' else self.openrouter_api_key
+        if provider == 'gemini':
+            options.setdefault('model', self.GEMINI_MODEL)
+        return LLMClient(provider, api_key, **options)
+    
+    def analyze_many(self, resumes, job_role=None, job_description=None, provider='gemini',
+                     concurrency=DEFAULT_CONCURRENCY, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                     timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES, bypass_cache=False, **options):
+        """
+        Analyze many resumes (texts or ResumeDocuments) with overlapping model
+        calls and return one analyze_resume_with_gemini()-style result per
+        resume, in input order. Calls run in their own event loop; from
+        async code, await analyze_many_async() instead.
+        """
+        client = self.llm_client(provider, concurrency=concurrency, requests_per_minute=requests_per_minute,
+                                 timeout=timeout, max_retries=max_retries, **options)
+        try:
+            return asyncio.run(self.analyze_many_async(resumes, client, job_role, job_description, bypass_cache))
+        finally:
+            client.close()
+    
+    async def analyze_many_async(self, resumes, client, job_role=None, job_description=None, bypass_cache=False):
+        """analyze_many() with a caller-provided LLMClient, inside the running event loop"""
+        if not client.api_key:
+            return [{"error": f"{client.provider} API key is not configured. Please add it to your .env file."}
+                    for _ in resumes]
+        
+        async def analyze(resume):
+            document = ResumeDocument.of(resume)
+            if not document.normalized_text:
+                return {"error": "Resume text is required for analysis."}
+            
+            cache_key = llm_cache_key(document.normalized_text, job_role, job_description,
+                                      client.model, self.ANALYSIS_PROMPT_VERSION)
+            if self.llm_cache is not None:
+                cached = await asyncio.to_thread(self.llm_cache.get, cache_key, bypass_cache)
+                if cached is not None:
+                    return {**cached, "cached": True}
+            
+            try:
+                response_text = await client.generate(self._analysis_prompt(document, job_description, job_role))
+            except Exception as e:
+                return {"error": f"Analysis failed: {str(e)}"}
+            
+            result = self._analysis_result(response_text)
+            if self.llm_cache is not None:
+                await asyncio.to_thread(self.llm_cache.put, cache_key, result, client.model)
+            return result
+        
+        return await asyncio.gather(*(analyze(resume) for resume in resumes))
 
     
     def generate_pdf_report(self, analysis_result, candidate_name, job_role):
@@ -1187,21 +1532,24 @@ class AIResumeAnalyzer:
             print(f"Error extracting ATS score: {str(e)}")
             return 0
             
-    def analyze_resume(self, resume_text, job_role=None, role_info=None, model="Google Gemini"):
+    def analyze_resume(self, resume_text, job_role=None, role_info=None, model="Google Gemini", bypass_cache=False):
         """
         Analyze a resume using the specified AI model
         
         Parameters:
-        - resume_text: The text content of the resume
+        - resume_text: The text content of the resume (or its ResumeDocument)
         - job_role: The target job role
         - role_info: Additional information about the job role
         - model: The AI model to use ("Google Gemini" or "Anthropic Claude")
+        - bypass_cache: Ignore cached responses and fetch a fresh analysis
         
         Returns:
-        - Dictionary containing analysis results
+        - Dictionary containing analysis results (with a 'timings' block when
+          profile_stages is set)
         """
         import traceback
         
+        timer = self.stage_timer()
         try:
             job_description = None
             if role_info:
@@ -1213,7 +1561,7 @@ class AIResumeAnalyzer:
             
             # Choose the appropriate model for analysis
             if model == "Google Gemini":
-                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role)
+                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role, bypass_cache)
                 model_used = "Google Gemini"
             elif model == "Anthropic Claude":
                 result = self.analyze_resume_with_anthropic(resume_text, job_description, job_role)
@@ -1221,9 +1569,11 @@ class AIResumeAnalyzer:
                 model_used = result.get("model_used", "Anthropic Claude")
             else:
                 # Default to Gemini if model not recognized
-                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role)
+                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role, bypass_cache)
                 model_used = "Google Gemini"
             
+            timer.lap('llm', len(resume_text))
+            
             # Process the result to extract structured information
             analysis_text = result.get("analysis", "")
             
@@ -1259,8 +1609,10 @@ class AIResumeAnalyzer:
             # Extract ATS score
             ats_score = self._extract_ats_score_from_text(analysis_text)
             
+            timer.lap('parse', len(analysis_text))
+            
             # Return structured analysis
-            return {
+            return timer.finish({
                 "score": score,
                 "ats_score": ats_score,
                 "strengths": strengths,
@@ -1268,12 +1620,12 @@ class AIResumeAnalyzer:
                 "suggestions": suggestions,
                 "full_response": analysis_text,
                 "model_used": model_used
-            }
+            })
             
         except Exception as e:
             print(f"Error in analyze_resume: {str(e)}")
             print(traceback.format_exc())
-            return {
+            return timer.finish({
                 "error": f"Analysis failed: {str(e)}",
                 "score": 0,
                 "ats_score": 0,
@@ -1282,7 +1634,7 @@ class AIResumeAnalyzer:
                 "suggestions": ["Try again with a different model or check your resume format."],
                 "full_response": f"Error: {str(e)}",
                 "model_used": "Error"
-            } 
+            })
 
     def simple_generate_pdf_report(self, analysis_result, candidate_name, job_role):
         """Generate a simple PDF report without complex charts as a fallback"""
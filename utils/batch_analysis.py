@@ -0,0 +1,127 @@
+"""
+Batch ATS scoring over a process pool.
+
+Each worker process builds one ResumeAnalyzer (which compiles the section
+segmenter) and the shared skill matcher in the pool initializer, together
+with the job requirements, so none of that is rebuilt or pickled per task.
+Resumes are sent in chunks, results stream back chunk by chunk as workers
+finish, and the batch is returned column by column in input order, with
+columns named after the resume_analysis table.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .resume_document import ResumeDocument
+
+# Per-resume output columns; the numeric and text columns match resume_analysis
+BATCH_COLUMNS = (
+    'ats_score', 'keyword_match_score', 'format_score', 'section_score',
+    'missing_skills', 'recommendations', 'document_type', 'error'
+)
+# Each worker gets about this many chunks so stragglers even out
+CHUNKS_PER_WORKER = 4
+
+
+def summarize_analysis(result):
+    """Flatten one analyze_resume() result into a BATCH_COLUMNS row"""
+    keyword_match = result.get('keyword_match', {})
+    return {
+        'ats_score': float(result.get('ats_score', 0)),
+        'keyword_match_score': float(keyword_match.get('score', 0)),
+        'format_score': float(result.get('format_score', 0)),
+        'section_score': float(result.get('section_score', 0)),
+        'missing_skills': ','.join(keyword_match.get('missing_skills', [])),
+        'recommendations': ','.join(result.get('suggestions', [])),
+        'document_type': result.get('document_type', 'unknown'),
+        'error': result.get('error', '')
+    }
+
+
+def _analyze_chunk(analyzer, job_requirements, chunk):
+    """Analyze [(index, text)] and return [(index, row)]"""
+    rows = []
+    for index, text in chunk:
+        result = analyzer.analyze_resume({'raw_text': ResumeDocument(text)}, job_requirements)
+        rows.append((index, summarize_analysis(result)))
+    return rows
+
+
+# Set once per worker process by the pool initializer
+_worker_analyzer = None
+_worker_job_requirements = None
+
+
+def _init_batch_worker(job_requirements):
+    global _worker_analyzer, _worker_job_requirements
+    from .resume_analyzer import ResumeAnalyzer
+    from .skill_index import get_skill_index
+    from .skill_matcher import get_skill_matcher
+
+    _worker_analyzer = ResumeAnalyzer()
+    _worker_job_requirements = job_requirements
+    # Compile the skill automaton and index before the first chunk arrives
+    get_skill_matcher(job_requirements.get('required_skills', []))
+    get_skill_index(job_requirements.get('required_skills', []))
+
+
+def _analyze_chunk_in_worker(chunk):
+    return _analyze_chunk(_worker_analyzer, _worker_job_requirements, chunk)
+
+
+def _as_text(document):
+    """Resume text from a string, ResumeDocument or {'raw_text': ...} dict"""
+    if isinstance(document, dict):
+        document = document.get('raw_text', '')
+    return ResumeDocument.of(document).text
+
+
+def iter_analyze_many(documents, job_requirements, workers=None, chunk_size=None, analyzer=None):
+    """
+    Yield (index, row) for every document as its chunk completes, in
+    completion order. Runs in-process (with analyzer, or a new
+    ResumeAnalyzer) when workers is 1 or there is only one chunk.
+    """
+    texts = [(index, _as_text(document)) for index, document in enumerate(documents)]
+    if not texts:
+        return
+    workers = max(1, workers or os.cpu_count() or 1)
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(texts) / (workers * CHUNKS_PER_WORKER)))
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    workers = min(workers, len(chunks))
+
+    if workers <= 1:
+        if analyzer is None:
+            from .resume_analyzer import ResumeAnalyzer
+            analyzer = ResumeAnalyzer()
+        for chunk in chunks:
+            yield from _analyze_chunk(analyzer, job_requirements, chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(job_requirements,)) as pool:
+        futures = [pool.submit(_analyze_chunk_in_worker, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def analyze_many(documents, job_requirements, workers=None, chunk_size=None, as_dataframe=False,
+                 on_result=None, analyzer=None):
+    """
+    Score many resumes against one role. Returns {column: [values]} over
+    BATCH_COLUMNS in input order, or a pandas DataFrame if as_dataframe is
+    set. on_result(index, row) is called as each result arrives.
+    """
+    rows = [None] * len(documents)
+    for index, row in iter_analyze_many(documents, job_requirements, workers, chunk_size, analyzer):
+        rows[index] = row
+        if on_result:
+            on_result(index, row)
+
+    columns = {column: [row[column] for row in rows] for column in BATCH_COLUMNS}
+    if as_dataframe:
+        import pandas as pd
+        return pd.DataFrame(columns, columns=list(BATCH_COLUMNS))
+    return columns
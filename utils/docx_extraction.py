@@ -0,0 +1,114 @@
+"""
+Streaming text extraction for DOCX resumes.
+
+Reads word/document.xml straight out of the zip with an incremental XML
+parser instead of building python-docx's object model. Paragraphs and table
+rows are emitted in document order and each finished block is dropped from
+the tree, so memory stays bounded by the largest single block. Table content,
+which python-docx's doc.paragraphs skips, is included; many resume templates
+put their skills grid in a table.
+"""
+
+import io
+import zipfile
+import xml.etree.ElementTree as ET
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_NS = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+
+_PARAGRAPH = W_NS + 'p'
+_TABLE = W_NS + 'tbl'
+_ROW = W_NS + 'tr'
+_CELL = W_NS + 'tc'
+_TEXT = W_NS + 't'
+_TAB = W_NS + 'tab'
+_BREAKS = (W_NS + 'br', W_NS + 'cr')
+_BODY = W_NS + 'body'
+# Legacy duplicate of text boxes; the modern copy lives in mc:Choice
+_FALLBACK = MC_NS + 'Fallback'
+
+# Cells of a table row are joined with this separator on one line
+CELL_SEPARATOR = ' | '
+# Engine name reported for text extracted here (e.g. in PageText)
+DOCX_ENGINE = 'docx-xml'
+
+
+def iter_docx_blocks(docx_bytes):
+    """
+    Yield ('paragraph', text) for body paragraphs and ('row', [cell texts])
+    for table rows, in document order. Nested tables are folded into the
+    text of the cell that contains them.
+    """
+    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as archive:
+        with archive.open('word/document.xml') as document:
+            body = None
+            paragraphs = []     # Text buffers of the open paragraphs
+            rows = []           # Cell lists of the open table rows
+            cells = []          # Paragraph lists of the open table cells
+            fallback_depth = 0
+
+            for event, elem in ET.iterparse(document, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    if tag == _BODY:
+                        body = elem
+                    elif tag == _FALLBACK:
+                        fallback_depth += 1
+                    elif fallback_depth:
+                        continue
+                    elif tag == _PARAGRAPH:
+                        paragraphs.append([])
+                    elif tag == _ROW:
+                        rows.append([])
+                    elif tag == _CELL:
+                        cells.append([])
+                    continue
+
+                if tag == _FALLBACK:
+                    fallback_depth -= 1
+                elif fallback_depth:
+                    pass
+                elif tag == _TEXT:
+                    if paragraphs and elem.text:
+                        paragraphs[-1].append(elem.text)
+                elif tag == _TAB:
+                    if paragraphs:
+                        paragraphs[-1].append('\t')
+                elif tag in _BREAKS:
+                    if paragraphs:
+                        paragraphs[-1].append('\n')
+                elif tag == _PARAGRAPH:
+                    text = ''.join(paragraphs.pop())
+                    if cells:
+                        cells[-1].append(text)
+                    else:
+                        yield 'paragraph', text
+                elif tag == _CELL:
+                    cell_text = ' '.join(part for part in cells.pop() if part.strip())
+                    if rows:
+                        rows[-1].append(cell_text)
+                elif tag == _ROW:
+                    row = rows.pop()
+                    if cells:
+                        # Nested table: fold the row into the enclosing cell
+                        cells[-1].append(CELL_SEPARATOR.join(cell for cell in row if cell))
+                    else:
+                        yield 'row', row
+
+                # Drop finished top-level blocks to keep memory bounded
+                if body is not None and tag in (_PARAGRAPH, _TABLE) and not (paragraphs or rows or cells):
+                    body.clear()
+
+
+def iter_docx_lines(docx_bytes):
+    """Yield one line per paragraph and per table row (cells joined by CELL_SEPARATOR)"""
+    for kind, content in iter_docx_blocks(docx_bytes):
+        if kind == 'paragraph':
+            yield content
+        else:
+            yield CELL_SEPARATOR.join(cell for cell in content if cell)
+
+
+def extract_docx_text(docx_bytes):
+    """Extract the text of a DOCX file, paragraphs and tables in document order"""
+    return '\n'.join(iter_docx_lines(docx_bytes))
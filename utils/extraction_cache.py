@@ -0,0 +1,222 @@
+"""
+Content-addressed cache for text extracted from uploaded resumes.
+
+Entries are keyed by the SHA-256 of the uploaded bytes plus the name and
+version of the extractor that produced them, so a re-upload, a tab switch or
+a Streamlit rerun of the same file is a hash lookup instead of a re-parse.
+Two tiers are kept: a small in-process LRU and an on-disk store with a size
+cap that evicts the least recently used files first. Callers always get
+their own copy of a cached value, so annotating a result never changes
+what later lookups return.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "EXTRACTION_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".extraction_cache")
+)
+DEFAULT_MEMORY_ENTRIES = 64
+DEFAULT_DISK_BYTES = 256 * 1024 * 1024  # 256 MB
+
+
+def read_upload_bytes(file):
+    """Return the raw bytes of an upload (bytes, BytesIO or Streamlit UploadedFile)"""
+    if isinstance(file, bytes):
+        return file
+    if isinstance(file, (bytearray, memoryview)):
+        return bytes(file)
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    if hasattr(file, 'read'):
+        position = file.tell() if hasattr(file, 'tell') else 0
+        file.seek(0)
+        content = file.read()
+        file.seek(position)
+        return content
+    raise TypeError(f"Unsupported upload type: {type(file).__name__}")
+
+
+def content_hash(content):
+    """SHA-256 hex digest of the uploaded bytes"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def make_cache_key(digest, extractor, version, *parts):
+    """Build a cache key from a content digest, extractor name/version and optional sub-keys"""
+    return ':'.join([digest, extractor, str(version)] + [str(part) for part in parts])
+
+
+class ExtractionCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_memory_entries=DEFAULT_MEMORY_ENTRIES,
+                 max_disk_bytes=DEFAULT_DISK_BYTES):
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None  # Computed lazily on first disk write
+        self.hits = 0
+        self.misses = 0
+
+    def _path_for(self, key):
+        """Map a cache key to its file on disk"""
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, name[:2], name + '.json')
+
+    def _remember(self, key, value):
+        """Insert into the in-memory LRU tier, evicting the oldest entry if full"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return a copy of the cached value for key, or None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._memory[key])
+
+        path = self._path_for(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)['value']
+            os.utime(path, None)  # Mark as recently used for disk eviction
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._remember(key, copy.deepcopy(value))
+        return value
+
+    def put(self, key, value):
+        """Store a copy of a JSON-serializable value in both tiers"""
+        with self._lock:
+            self._remember(key, copy.deepcopy(value))
+
+        if self.max_disk_bytes <= 0:
+            return
+        path = self._path_for(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            payload = json.dumps({'key': key, 'value': value}).encode('utf-8')
+            # An entry being replaced no longer counts towards the disk tier
+            try:
+                replaced_bytes = os.stat(path).st_size
+            except OSError:
+                replaced_bytes = 0
+            # Write atomically so concurrent readers never see a partial file
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(payload)
+                os.replace(temp_path, path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+                raise
+        except OSError as e:
+            print(f"Error writing extraction cache entry: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(payload) - replaced_bytes
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _disk_entries(self):
+        """Yield (path, size, mtime) for every entry on disk"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _scan_disk_bytes(self):
+        return sum(size for _, size, _ in self._disk_entries())
+
+    def _evict_disk(self):
+        """Delete least recently used files until the disk tier is under 90% of its cap"""
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_disk_bytes * 0.9)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                continue
+        self._disk_bytes = total
+
+    def get_or_extract(self, content, extractor, version, extract_fn, cacheable=bool, parts=()):
+        """
+        Return the cached result for content, calling extract_fn(content) on a miss.
+        Results for which cacheable(value) is false (by default empty ones) are
+        not cached so a failed extraction is retried next time. parts are
+        extra sub-keys for options that change the output (e.g. a page limit).
+        """
+        key = make_cache_key(content_hash(content), extractor, version, *parts)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        value = extract_fn(content)
+        if cacheable(value):
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            for path, _, _ in list(self._disk_entries()):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            self._disk_bytes = 0
+
+    def stats(self):
+        """Return hit/miss counters and tier sizes"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'memory_entries': len(self._memory),
+                'disk_bytes': self._disk_bytes if self._disk_bytes is not None else self._scan_disk_bytes()
+            }
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_extraction_cache():
+    """Return the process-wide cache shared by every extractor"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ExtractionCache()
+        return _shared_cache
@@ -0,0 +1,147 @@
+"""
+Persistent cache of LLM analysis responses.
+
+A response is keyed by the SHA-256 of everything that determines it: the
+normalized resume text, job role, job description, model name and prompt
+template version. Analyzing the same resume for the same role again (a
+second click, a rerun, another session) is then a SQLite lookup instead of
+a paid model call. Entries expire after a TTL, and once the store holds
+more than max_entries the least recently used ones are evicted. The
+database is a separate file next to resume_data.db.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.db")
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600  # One week
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def llm_cache_key(resume_text, job_role, job_description, model, prompt_version):
+    """Cache key of one analysis request; whitespace in the job description is normalized"""
+    request = [resume_text, job_role or '', ' '.join((job_description or '').split()), model, str(prompt_version)]
+    return hashlib.sha256(json.dumps(request).encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._ready = False
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._ready:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses (last_used)')
+            conn.commit()
+            self._ready = True
+        return conn
+
+    def get(self, key, bypass=False):
+        """
+        Return the cached response for key, or None if missing or expired.
+        With bypass the lookup is skipped (and counted), so the caller
+        fetches a fresh response and put() replaces the stored one.
+        """
+        if bypass:
+            with self._lock:
+                self.bypassed += 1
+            return None
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute('SELECT response, created_at FROM llm_responses WHERE key = ?',
+                                   (key,)).fetchone()
+                if row is None or now - row[1] > self.ttl_seconds:
+                    if row is not None:
+                        conn.execute('DELETE FROM llm_responses WHERE key = ?', (key,))
+                        conn.commit()
+                    self.misses += 1
+                    return None
+                conn.execute('UPDATE llm_responses SET last_used = ? WHERE key = ?', (now, key))
+                conn.commit()
+                self.hits += 1
+                return json.loads(row[0])
+            except (sqlite3.Error, ValueError) as e:
+                print(f"Error reading LLM cache entry: {e}")
+                self.misses += 1
+                return None
+            finally:
+                conn.close()
+
+    def put(self, key, value, model=''):
+        """Store a JSON-serializable response, then drop expired and least recently used entries"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute('''
+                INSERT OR REPLACE INTO llm_responses (key, model, response, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?)
+                ''', (key, model, json.dumps(value), now, now))
+                conn.execute('DELETE FROM llm_responses WHERE created_at < ?', (now - self.ttl_seconds,))
+                conn.execute('''
+                DELETE FROM llm_responses WHERE key IN (
+                    SELECT key FROM llm_responses ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                ''', (self.max_entries,))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error writing LLM cache entry: {e}")
+                conn.rollback()
+            finally:
+                conn.close()
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute('DELETE FROM llm_responses')
+                conn.commit()
+            finally:
+                conn.close()
+
+    def stats(self):
+        """Return hit/miss/bypass counters of this process and the number of stored entries"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                entries = conn.execute('SELECT COUNT(*) FROM llm_responses').fetchone()[0]
+            finally:
+                conn.close()
+            return {'hits': self.hits, 'misses': self.misses, 'bypassed': self.bypassed, 'entries': entries}
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Return the process-wide LLM response cache"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMResponseCache()
+        return _shared_cache
@@ -0,0 +1,219 @@
+"""
+Asynchronous client for the Gemini and OpenRouter HTTP APIs.
+
+Many analyses can be in flight at once. Each client bounds them with three
+limits:
+- a semaphore caps concurrent requests;
+- a token bucket keeps the request rate within the provider's quota
+  (requests_per_minute, with bursts of up to `burst` requests);
+- every attempt has a timeout.
+
+A 429, a 5xx, a timeout or a connection error is retried with full-jitter
+exponential backoff (a random delay up to base * 2**attempt, capped),
+honouring Retry-After when the provider sends one.
+
+Requests go through the standard library (urllib in worker threads), so no
+HTTP package is needed. base_url points a client at another endpoint, such
+as a local mock server in tests.
+"""
+
+import asyncio
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+DEFAULT_MODELS = {'gemini': "gemini-2.5-flash", 'openrouter': "anthropic/claude-3.5-sonnet"}
+
+DEFAULT_CONCURRENCY = 8
+# Set to the quota of your API plan
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_TIMEOUT = 60  # Seconds per attempt
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE = 1.0  # Seconds
+DEFAULT_BACKOFF_MAX = 30.0
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LLMRequestError(Exception):
+    """A model request that failed for good; status is the last HTTP status, if any"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class TokenBucket:
+    """
+    Allows `rate` acquisitions per second on average and up to `capacity`
+    at once. acquire() waits until a token is available.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        # Waiters are served one at a time, in arrival order
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+def _gemini_request(base_url, model, api_key, prompt):
+    url = f"{base_url}/models/{model}:generateContent?key={api_key}"
+    body = {"contents": [{"parts": [{"text": prompt}]}]}
+    return url, {}, body
+
+
+def _gemini_text(payload):
+    parts = payload["candidates"][0]["content"]["parts"]
+    return "".join(part.get("text", "") for part in parts)
+
+
+def _openrouter_request(base_url, model, api_key, prompt):
+    url = f"{base_url}/chat/completions"
+    body = {"model": model, "messages": [{"role": "user", "content": prompt}]}
+    return url, {"Authorization": f"Bearer {api_key}"}, body
+
+
+def _openrouter_text(payload):
+    return payload["choices"][0]["message"]["content"]
+
+
+# provider -> (default base URL, request builder, response text reader)
+PROVIDERS = {
+    'gemini': (GEMINI_BASE_URL, _gemini_request, _gemini_text),
+    'openrouter': (OPENROUTER_BASE_URL, _openrouter_request, _openrouter_text),
+}
+
+
+def _post_json(url, headers, body, timeout):
+    """Blocking JSON POST; returns (status, parsed body, Retry-After seconds or None)"""
+    request = urllib.request.Request(
+        url, data=json.dumps(body).encode('utf-8'), method='POST',
+        headers={'Content-Type': 'application/json', **headers}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.loads(response.read().decode('utf-8')), None
+    except urllib.error.HTTPError as e:
+        retry_after = e.headers.get('Retry-After') if e.headers else None
+        try:
+            retry_after = float(retry_after) if retry_after is not None else None
+        except ValueError:
+            retry_after = None  # An HTTP date; fall back to backoff
+        return e.code, e.read().decode('utf-8', 'replace'), retry_after
+
+
+class LLMClient:
+    """
+    Sends prompts to one provider ('gemini' or 'openrouter') within the
+    client's concurrency, rate and retry limits. Use one client per
+    provider and key, so every request shares the same limits.
+    """
+
+    def __init__(self, provider, api_key, model=None, base_url=None, concurrency=DEFAULT_CONCURRENCY,
+                 requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, burst=None, timeout=DEFAULT_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff_base=DEFAULT_BACKOFF_BASE,
+                 backoff_max=DEFAULT_BACKOFF_MAX):
+        if provider not in PROVIDERS:
+            raise ValueError(f"Unknown LLM provider: {provider} (expected one of {', '.join(PROVIDERS)})")
+        default_url, self._build_request, self._read_text = PROVIDERS[provider]
+        self.provider = provider
+        self.api_key = api_key
+        self.model = model or DEFAULT_MODELS[provider]
+        self.base_url = (base_url or default_url).rstrip('/')
+        self.concurrency = concurrency
+        self.requests_per_minute = requests_per_minute
+        # Bursts default to the concurrency, so a full batch can start at once
+        self.burst = burst or concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Created on first use, inside the event loop that runs the requests
+        self._semaphore = None
+        self._bucket = None
+        self._executor = None
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0}
+
+    def _limits(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._bucket = TokenBucket(self.requests_per_minute / 60, self.burst)
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                                thread_name_prefix=f"llm-{self.provider}")
+        return self._semaphore, self._bucket
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """Seconds to wait before retry number attempt (0-based)"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    async def generate(self, prompt):
+        """Return the model's text response to prompt, or raise LLMRequestError"""
+        semaphore, bucket = self._limits()
+        url, headers, body = self._build_request(self.base_url, self.model, self.api_key, prompt)
+        loop = asyncio.get_running_loop()
+        status = None
+        error = None
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    self.stats['retries'] += 1
+                await bucket.acquire()
+                self.stats['requests'] += 1
+                retry_after = None
+                try:
+                    status, payload, retry_after = await asyncio.wait_for(
+                        loop.run_in_executor(self._executor, _post_json, url, headers, body, self.timeout),
+                        self.timeout
+                    )
+                except (asyncio.TimeoutError, TimeoutError):
+                    status, error = None, f"timed out after {self.timeout}s"
+                except (urllib.error.URLError, OSError) as e:
+                    status, error = None, f"connection failed: {getattr(e, 'reason', e)}"
+                else:
+                    if status < 300:
+                        try:
+                            return self._read_text(payload)
+                        except (KeyError, IndexError, TypeError) as e:
+                            self.stats['failures'] += 1
+                            raise LLMRequestError(f"Unexpected {self.provider} response: {e!r}", status)
+                    error = f"HTTP {status}: {str(payload)[:200]}"
+                    if status not in RETRY_STATUSES:
+                        break
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self.backoff_delay(attempt, retry_after))
+
+        self.stats['failures'] += 1
+        raise LLMRequestError(f"{self.provider} request failed: {error}", status)
+
+    async def generate_many(self, prompts):
+        """Responses to prompts in input order; a failed prompt yields its LLMRequestError"""
+        return await asyncio.gather(*(self.generate(prompt) for prompt in prompts), return_exceptions=True)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._semaphore = self._bucket = self._executor = None
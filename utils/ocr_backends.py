@@ -0,0 +1,162 @@
+"""
+Tesseract OCR backends.
+
+pytesseract writes every page image to a temporary file and starts a new
+tesseract process for it, which reloads the language data each time.
+TesserocrBackend instead keeps a small, fixed pool of tesserocr engines
+alive for the whole process. Each page checks an engine out and returns it,
+whichever thread it runs on (extraction engine threads and Streamlit script
+threads are short-lived), so initialisation is paid once per engine and
+pages are handed to it in memory. pytesseract remains the fallback when
+tesserocr (or its tessdata) is not available.
+"""
+
+import os
+import queue
+import threading
+from collections import OrderedDict
+
+DEFAULT_OCR_LANGUAGE = 'eng'
+# Most tesserocr engines a process keeps (each holds its language data, ~40 MB for eng)
+DEFAULT_ENGINE_POOL_SIZE = 2
+# 'auto' picks the first backend in OCR_BACKENDS that can be started
+DEFAULT_OCR_BACKEND = os.getenv('OCR_BACKEND', 'auto')
+
+
+class PytesseractBackend:
+    """One tesseract subprocess per page via pytesseract"""
+    name = 'pytesseract'
+
+    def __init__(self, lang=DEFAULT_OCR_LANGUAGE):
+        import pytesseract
+
+        self._pytesseract = pytesseract
+        self.lang = lang
+
+    def warm_up(self):
+        """Nothing to keep warm; fail early if the tesseract binary is missing"""
+        self._pytesseract.get_tesseract_version()
+
+    def image_to_string(self, image):
+        return self._pytesseract.image_to_string(image, lang=self.lang)
+
+    def close(self):
+        pass
+
+
+class TesserocrBackend:
+    """In-process Tesseract via tesserocr, with a fixed-size pool of warm engines"""
+    name = 'tesserocr'
+
+    def __init__(self, lang=DEFAULT_OCR_LANGUAGE, pool_size=DEFAULT_ENGINE_POOL_SIZE):
+        import tesserocr
+
+        self._tesserocr = tesserocr
+        self.lang = lang
+        self.pool_size = pool_size
+        # Idle engines; the most recently used one is handed out first
+        self._idle = queue.LifoQueue()
+        self._apis = []  # Every engine created, idle or checked out
+        self._lock = threading.Lock()
+
+    def _checkout(self):
+        """Take an idle engine, create one while the pool is not full, or wait for one"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = len(self._apis) < self.pool_size
+            if create:
+                api = self._tesserocr.PyTessBaseAPI(lang=self.lang)
+                self._apis.append(api)
+        return api if create else self._idle.get()
+
+    def _checkin(self, api):
+        self._idle.put(api)
+
+    def warm_up(self):
+        """Load the language data now rather than on the first page"""
+        self._checkin(self._checkout())
+
+    def image_to_string(self, image):
+        api = self._checkout()
+        try:
+            api.SetImage(image)
+            return api.GetUTF8Text()
+        finally:
+            api.Clear()
+            self._checkin(api)
+
+    def close(self):
+        """End every engine; call only once no page is being OCR'd"""
+        with self._lock:
+            for api in self._apis:
+                api.End()
+            self._apis = []
+            self._idle = queue.LifoQueue()
+
+
+# Preferred first when the backend is 'auto'
+OCR_BACKENDS = OrderedDict([
+    ('tesserocr', TesserocrBackend),
+    ('pytesseract', PytesseractBackend),
+])
+
+_backends = {}
+_backends_pid = None
+_backends_lock = threading.Lock()
+
+
+def _start_backend(name, lang):
+    backend = OCR_BACKENDS[name](lang)
+    backend.warm_up()
+    return backend
+
+
+def get_ocr_backend(name=DEFAULT_OCR_BACKEND, lang=DEFAULT_OCR_LANGUAGE):
+    """
+    Return the process-wide, already warmed up backend called `name`
+    ('tesserocr', 'pytesseract' or 'auto'). 'auto' falls back through
+    OCR_BACKENDS in order. Raises ImportError if no backend can be started.
+    """
+    global _backends, _backends_pid
+    if name != 'auto' and name not in OCR_BACKENDS:
+        raise ValueError(f"Unknown OCR backend: {name}")
+
+    with _backends_lock:
+        # Engines inherited from a forked parent are not safe to reuse
+        if _backends_pid != os.getpid():
+            _backends = {}
+            _backends_pid = os.getpid()
+
+        key = (name, lang)
+        if key in _backends:
+            return _backends[key]
+
+        if name != 'auto':
+            backend = _start_backend(name, lang)
+        else:
+            errors = []
+            for candidate in OCR_BACKENDS:
+                try:
+                    backend = _start_backend(candidate, lang)
+                    break
+                except Exception as e:
+                    errors.append(f"{candidate}: {e}")
+            else:
+                raise ImportError("No OCR backend available (" + "; ".join(errors) + ")")
+        _backends[key] = backend
+        return backend
+
+
+def available_ocr_backends(lang=DEFAULT_OCR_LANGUAGE):
+    """Names of the backends that can be started in this environment"""
+    names = []
+    for name in OCR_BACKENDS:
+        try:
+            get_ocr_backend(name, lang)
+            names.append(name)
+        except Exception:
+            continue
+    return names
@@ -0,0 +1,282 @@
+"""
+Page-level text extraction shared by the resume extractors.
+
+Each engine is a generator that yields one PageText per page as soon as that
+page has been parsed, so callers can start working on page 1, or stop after
+it, without waiting for the rest of the document. Engines are registered by
+name in PDF_TEXT_ENGINES so extractors and benchmarks select them the same
+way.
+
+ExtractionScheduler runs whole-document engines cheapest-first under a
+per-engine latency budget. It escalates to the next, more expensive
+engine while the quality score of the text so far is too low, and goes
+straight to OCR when an accepted text layer still has image-only pages.
+"""
+
+import io
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import partial
+
+# Extracted text scoring at least this much is accepted without escalating
+DEFAULT_MIN_QUALITY = 0.6
+
+# Words whose presence on a short line marks a resume section heading
+SECTION_HEADER_WORDS = (
+    'experience', 'education', 'skills', 'summary', 'projects', 'objective',
+    'certifications', 'employment', 'profile', 'achievements', 'contact'
+)
+
+# page_number is 1-based, engine names the library that produced the text and
+# elapsed is the wall-clock seconds spent on that page
+PageText = namedtuple('PageText', ['page_number', 'text', 'engine', 'elapsed'])
+
+
+def sniff_format(content):
+    """Guess the upload format from its magic bytes: 'pdf', 'docx' or None"""
+    head = bytes(content[:8])
+    if head.startswith(b'%PDF'):
+        return 'pdf'
+    if head.startswith(b'PK'):
+        return 'docx'
+    return None
+
+
+def iter_pypdf_pages(pdf_bytes, engine='pypdf', max_pages=None):
+    """Yield PageText per page (the first max_pages only, if set) using pypdf or the legacy PyPDF2"""
+    if engine == 'PyPDF2':
+        import PyPDF2 as pypdf_module
+    else:
+        import pypdf as pypdf_module
+
+    pdf_reader = pypdf_module.PdfReader(io.BytesIO(pdf_bytes))
+    for page_number, page in enumerate(pdf_reader.pages, start=1):
+        if max_pages is not None and page_number > max_pages:
+            break
+        start = time.perf_counter()
+        text = page.extract_text() or ""
+        yield PageText(page_number, text, engine, time.perf_counter() - start)
+
+
+def iter_pdfium_pages(pdf_bytes, max_pages=None):
+    """Yield PageText per page (the first max_pages only, if set) using pdfium's text layer"""
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    try:
+        page_count = len(pdf) if max_pages is None else min(len(pdf), max_pages)
+        for index in range(page_count):
+            start = time.perf_counter()
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_range().replace('\r\n', '\n').replace('\r', '\n')
+            finally:
+                textpage.close()
+                page.close()
+            yield PageText(index + 1, text, 'pdfium', time.perf_counter() - start)
+    finally:
+        pdf.close()
+
+
+def iter_pdfplumber_pages(pdf_bytes, max_pages=None):
+    """Yield PageText per page (the first max_pages only, if set) using pdfplumber"""
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        for page_number, page in enumerate(pdf.pages[:max_pages], start=1):
+            start = time.perf_counter()
+            text = page.extract_text() or ""
+            yield PageText(page_number, text, 'pdfplumber', time.perf_counter() - start)
+
+
+# Page-level text engines by name; each is fn(pdf_bytes, max_pages=None)
+# returning a PageText generator
+PDF_TEXT_ENGINES = OrderedDict([
+    ('pypdf', partial(iter_pypdf_pages, engine='pypdf')),
+    ('PyPDF2', partial(iter_pypdf_pages, engine='PyPDF2')),
+    ('pdfium', iter_pdfium_pages),
+    ('pdfplumber', iter_pdfplumber_pages),
+])
+
+
+def register_pdf_engine(name, iter_pages_fn):
+    """Add (or replace) a text engine; iter_pages_fn(pdf_bytes, max_pages=None) yields PageText"""
+    PDF_TEXT_ENGINES[name] = iter_pages_fn
+
+
+def iter_engine_pages(pdf_bytes, engine, max_pages=None):
+    """Yield PageText per page using the registered engine called `engine`"""
+    if engine not in PDF_TEXT_ENGINES:
+        raise ValueError(f"Unknown PDF text engine: {engine}")
+    return PDF_TEXT_ENGINES[engine](pdf_bytes, max_pages=max_pages)
+
+
+def join_pages(pages):
+    """Join page texts with a trailing newline per page, in a single allocation"""
+    return "".join(page.text + "\n" for page in pages)
+
+
+def score_text_quality(text, page_texts=None, ocr_pages=()):
+    """
+    Score extracted text from 0.0 (garbage/empty) to 1.0 (clean resume text).
+
+    Combines the share of printable characters, how word-like the tokens are
+    (scrambled layouts produce run-together or letter-spaced tokens) and how
+    many section headings were recognised. When page texts are given, the
+    score is scaled by the fraction of pages that have text and are not in
+    ocr_pages (image-only pages); a short page of real text is not penalized.
+    """
+    if not text or not text.strip():
+        return 0.0
+
+    printable = sum(1 for ch in text if ch.isprintable() or ch in '\n\t') / len(text)
+
+    tokens = text.split()
+    word_like = sum(1 for token in tokens if 2 <= len(token) <= 15) / len(tokens)
+
+    headers = set()
+    for line in text.split('\n'):
+        if len(line.split()) <= 4:
+            lowered = line.lower()
+            headers.update(word for word in SECTION_HEADER_WORDS if word in lowered)
+    sections = min(1.0, len(headers) / 3)
+
+    score = 0.35 * printable + 0.4 * word_like + 0.25 * sections
+    if page_texts:
+        covered = sum(1 for page_number, page_text in enumerate(page_texts, start=1)
+                      if page_text.strip() and page_number not in ocr_pages)
+        score *= covered / len(page_texts)
+    return round(score, 3)
+
+
+# Engine threads still running, by key: (thread, outcome)
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def run_with_timeout(fn, args, timeout, on_thread_start=None, key=None):
+    """
+    Run fn(*args) in a daemon thread and wait at most `timeout` seconds.
+
+    Returns (status, value) with status 'ok', 'timeout' or 'error'. A timed
+    out engine cannot be killed; its thread is abandoned and finishes (or
+    hangs) in the background without blocking the caller. When a key is
+    given and a thread for the same key is still running (e.g. a rerun on
+    the same document), that thread is waited on instead of starting
+    another, so a slow document never has more than one thread per key.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome['value'] = fn(*args)
+        except Exception as e:
+            outcome['error'] = e
+        finally:
+            if key is not None:
+                with _in_flight_lock:
+                    _in_flight.pop(key, None)
+
+    with _in_flight_lock:
+        if key in _in_flight:
+            thread, outcome = _in_flight[key]
+        else:
+            thread = threading.Thread(target=target, name='extraction-engine', daemon=True)
+            if on_thread_start:
+                on_thread_start(thread)
+            if key is not None:
+                _in_flight[key] = (thread, outcome)
+            thread.start()
+    thread.join(timeout)
+
+    if thread.is_alive():
+        return 'timeout', None
+    if 'error' in outcome:
+        return 'error', outcome['error']
+    return 'ok', outcome.get('value')
+
+
+class ExtractionScheduler:
+    """
+    Runs extraction engines cheapest-first and escalates only while quality
+    is below min_quality or pages still need OCR.
+
+    engines is a list of (name, fn, budget_seconds). Each fn(content, previous)
+    returns a dict with at least 'text' (and optionally 'page_texts', and
+    'ocr_pages': the 1-based pages it found to be image-only); previous
+    maps the names of engines that already ran to their outputs so later
+    engines can reuse earlier work. run(content, key) passes (key, name)
+    to run_with_timeout, so a rerun on the same content joins an engine
+    still running from the earlier run. The quality score only ranks text
+    layers: when the best one has image-only pages, the cascade skips to
+    the engine named ocr_engine whatever its score. on_thread_start(thread)
+    is called before each engine thread starts (e.g. to attach a Streamlit
+    script context).
+    """
+
+    def __init__(self, engines, min_quality=DEFAULT_MIN_QUALITY, on_thread_start=None, ocr_engine='ocr'):
+        self.engines = engines
+        self.min_quality = min_quality
+        self.on_thread_start = on_thread_start
+        self.ocr_engine = ocr_engine
+
+    def _rank(self, quality, output):
+        """
+        Acceptable outputs first, then (among those) the fewest image-only
+        pages left without text, then the highest quality
+        """
+        acceptable = quality >= self.min_quality
+        return acceptable, -len(output.get('ocr_pages', [])) if acceptable else 0, quality
+
+    def run(self, content, key=None):
+        """
+        Extract text from content and return a report:
+        {'text', 'engine', 'quality', 'ocr_pages', 'attempts': [{'engine', 'status', 'seconds', 'quality'}]}
+        ocr_pages lists the image-only pages the chosen output still lacks
+        text for. Attempts also carry the engine's 'stats' dict when it
+        returned one.
+        """
+        attempts = []
+        previous = {}
+        best_name, best_quality, best_output = None, -1.0, None
+        skip_to_ocr = False
+
+        for index, (name, fn, budget) in enumerate(self.engines):
+            if skip_to_ocr and name != self.ocr_engine:
+                continue
+            start = time.perf_counter()
+            status, value = run_with_timeout(fn, (content, previous), budget, self.on_thread_start,
+                                             key=(key, name) if key is not None else None)
+            seconds = time.perf_counter() - start
+
+            quality = 0.0
+            attempt = {'engine': name, 'status': status, 'seconds': round(seconds, 3)}
+            if status == 'ok' and value:
+                previous[name] = value
+                if 'stats' in value:
+                    attempt['stats'] = value['stats']
+                quality = score_text_quality(value.get('text', ''), value.get('page_texts'), value.get('ocr_pages', ()))
+                if best_output is None or self._rank(quality, value) > self._rank(best_quality, best_output):
+                    best_name, best_quality, best_output = name, quality, value
+            elif status == 'error':
+                attempt['error'] = str(value)
+            attempt['quality'] = quality
+            attempts.append(attempt)
+
+            if best_quality >= self.min_quality:
+                later = [later_name for later_name, _, _ in self.engines[index + 1:]]
+                if best_output.get('ocr_pages') and self.ocr_engine in later:
+                    # Good text layer, but some pages are images: OCR those pages next
+                    skip_to_ocr = True
+                else:
+                    break
+
+        return {
+            'text': best_output.get('text', '') if best_output else '',
+            'engine': best_name,
+            'quality': max(best_quality, 0.0),
+            'ocr_pages': list(best_output.get('ocr_pages', [])) if best_output else [],
+            'attempts': attempts
+        }
@@ -0,0 +1,297 @@
+"""
+OCR helpers for image-based (scanned) PDFs.
+
+Pages are classified by their text-layer character count and image coverage
+so only the image-only pages of a mixed document are OCR'd. Those pages are
+split into contiguous ranges and each range is rasterized and OCR'd in its
+own worker process, so a multi-page scan uses every core instead of one.
+Results are reassembled in page order.
+
+Everything works on the PDF bytes in memory: pages are rasterized one at a
+time with pdfium when it is installed, and only fall back to poppler (which
+needs the PDF on disk, in a temporary directory removed as soon as the range
+is done) otherwise. Each page is rendered in grayscale at a DPI chosen from
+its size so that the bitmaps alive across all workers stay under a
+per-request memory ceiling, then binarized and handed to a warm OCR backend
+(see ocr_backends) started once per worker process.
+"""
+
+import io
+import math
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .ocr_backends import DEFAULT_OCR_BACKEND, get_ocr_backend
+
+# A page with fewer text-layer characters than this is a candidate for OCR
+MIN_TEXT_LAYER_CHARS = 40
+# ...if at least this fraction of it is covered by images
+MIN_IMAGE_COVERAGE = 0.3
+# Pages are rasterized at up to this resolution; larger pages get a lower DPI
+MAX_OCR_DPI = 300
+# Default per-request ceiling on page bitmap memory, shared by all OCR workers
+DEFAULT_OCR_MEMORY_CEILING = 256 * 1024 * 1024  # 256 MB
+# Grayscale page plus its 1-bit copy, per pixel
+RASTER_BYTES_PER_PIXEL = 1.125
+# Grayscale values above this become white when binarizing for Tesseract
+BINARIZE_THRESHOLD = 160
+# Smallest per-page budget worth running a worker for (letter size at 150 DPI)
+MIN_PAGE_RASTER_BYTES = int(8.5 * 11 * 150 * 150 * RASTER_BYTES_PER_PIXEL)
+
+
+def choose_dpi(width_pt, height_pt, max_page_bytes):
+    """
+    Highest DPI (up to MAX_OCR_DPI) at which a page of the given size in
+    points fits in max_page_bytes as a grayscale + 1-bit raster
+    """
+    area_in2 = max((width_pt / 72.0) * (height_pt / 72.0), 1e-6)
+    dpi = int(math.sqrt(max_page_bytes / (area_in2 * RASTER_BYTES_PER_PIXEL)))
+    return max(1, min(MAX_OCR_DPI, dpi))
+
+
+def binarize(image):
+    """Convert a page image to 1-bit black and white for Tesseract"""
+    if image.mode != 'L':
+        image = image.convert('L')
+    return image.point(lambda value: 255 if value > BINARIZE_THRESHOLD else 0, mode='1')
+
+
+def rasterize_pages(pdf_bytes, first_page, last_page, poppler_path=None, max_page_bytes=DEFAULT_OCR_MEMORY_CEILING):
+    """
+    Yield (1-bit PIL image, dpi) for each page first_page..last_page (1-based,
+    inclusive), one page at a time so only a single page bitmap is alive at
+    once. The DPI of each page is chosen from its size so the raster stays
+    within max_page_bytes.
+    """
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
+
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(pdf_bytes)
+        try:
+            for index in range(first_page - 1, last_page):
+                page = pdf[index]
+                try:
+                    dpi = choose_dpi(*page.get_size(), max_page_bytes)
+                    image = binarize(page.render(scale=dpi / 72, grayscale=True).to_pil())
+                finally:
+                    page.close()
+                yield image, dpi
+                del image
+        finally:
+            pdf.close()
+        return
+
+    # Last resort: poppler only reads from disk
+    import pypdf
+    from pdf2image import convert_from_path
+
+    pdf_reader = pypdf.PdfReader(io.BytesIO(pdf_bytes))
+    temp_dir = tempfile.mkdtemp(prefix='resume_ocr_')
+    try:
+        pdf_path = os.path.join(temp_dir, 'upload.pdf')
+        with open(pdf_path, 'wb') as f:
+            f.write(pdf_bytes)
+        for page_number in range(first_page, last_page + 1):
+            box = pdf_reader.pages[page_number - 1].mediabox
+            dpi = choose_dpi(float(box.width), float(box.height), max_page_bytes)
+            image = binarize(convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number,
+                                               grayscale=True, poppler_path=poppler_path)[0])
+            yield image, dpi
+            del image
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def peak_rss_bytes():
+    """
+    Peak resident set size over this process's lifetime, or None where
+    unsupported. Only meaningful per request in a fresh worker process.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def current_rss_bytes():
+    """Current resident set size of this process, or None where unsupported (Linux only)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _ocr_page_range(pdf_bytes, first_page, last_page, poppler_path=None, max_page_bytes=DEFAULT_OCR_MEMORY_CEILING,
+                    ocr_backend=DEFAULT_OCR_BACKEND):
+    """
+    Rasterize and OCR pages first_page..last_page (1-based, inclusive).
+    Returns (first_page, texts, stats) where stats records the OCR backend,
+    the DPI used per page, the largest page raster and the largest RSS
+    sampled while each page bitmap was alive.
+    """
+    backend = get_ocr_backend(ocr_backend)
+
+    texts = []
+    stats = {'backend': backend.name, 'dpi': [], 'peak_raster_bytes': 0, 'peak_rss_bytes': 0}
+    for image, dpi in rasterize_pages(pdf_bytes, first_page, last_page, poppler_path, max_page_bytes):
+        width, height = image.size
+        stats['dpi'].append(dpi)
+        stats['peak_raster_bytes'] = max(stats['peak_raster_bytes'],
+                                         int(width * height * RASTER_BYTES_PER_PIXEL))
+        texts.append(backend.image_to_string(image))
+        stats['peak_rss_bytes'] = max(stats['peak_rss_bytes'], current_rss_bytes() or 0)
+        del image
+    return first_page, texts, stats
+
+
+# Set once per worker process by the pool initializer so the PDF bytes are
+# pickled once per worker rather than once per page range
+_worker_pdf_bytes = None
+_worker_poppler_path = None
+_worker_max_page_bytes = DEFAULT_OCR_MEMORY_CEILING
+_worker_ocr_backend = DEFAULT_OCR_BACKEND
+
+
+def _init_ocr_worker(pdf_bytes, poppler_path, max_page_bytes, ocr_backend):
+    global _worker_pdf_bytes, _worker_poppler_path, _worker_max_page_bytes, _worker_ocr_backend
+    _worker_pdf_bytes = pdf_bytes
+    _worker_poppler_path = poppler_path
+    _worker_max_page_bytes = max_page_bytes
+    _worker_ocr_backend = ocr_backend
+    # Start the OCR engine once per worker, before the first page arrives
+    get_ocr_backend(ocr_backend)
+
+
+def _ocr_page_range_in_worker(first_page, last_page):
+    first_page, texts, stats = _ocr_page_range(_worker_pdf_bytes, first_page, last_page, _worker_poppler_path,
+                                               _worker_max_page_bytes, _worker_ocr_backend)
+    # Workers live for one ocr_pages() call, so their lifetime peak is this request's
+    stats['peak_rss_bytes'] = max(stats['peak_rss_bytes'], peak_rss_bytes() or 0)
+    return first_page, texts, stats
+
+
+def get_page_count(pdf_bytes):
+    """Return the number of pages in a PDF"""
+    import pypdf
+
+    return len(pypdf.PdfReader(io.BytesIO(pdf_bytes)).pages)
+
+
+def split_page_ranges(pages, chunks):
+    """
+    Split pages into at most about `chunks` contiguous (first, last) ranges.
+    `pages` is either a page count or an iterable of 1-based page numbers;
+    gaps between requested pages always start a new range.
+    """
+    if isinstance(pages, int):
+        pages = range(1, pages + 1)
+    pages = sorted(set(pages))
+    if not pages:
+        return []
+    size = math.ceil(len(pages) / max(1, chunks))
+    ranges = []
+    first = last = pages[0]
+    for page in pages[1:]:
+        if page == last + 1 and page - first < size:
+            last = page
+        else:
+            ranges.append((first, last))
+            first = last = page
+    ranges.append((first, last))
+    return ranges
+
+
+def default_ocr_workers():
+    """Size of the OCR process pool: one worker per core"""
+    return os.cpu_count() or 1
+
+
+def image_coverage(page):
+    """Fraction of a pdfplumber page's area covered by embedded images (0.0 - 1.0)"""
+    page_area = float(page.width * page.height)
+    if page_area <= 0:
+        return 0.0
+    covered = 0.0
+    for image in page.images:
+        width = min(image['x1'], page.width) - max(image['x0'], 0)
+        height = min(image['bottom'], page.height) - max(image['top'], 0)
+        if width > 0 and height > 0:
+            covered += width * height
+    return min(1.0, covered / page_area)
+
+
+def page_needs_ocr(char_count, coverage):
+    """
+    A page is routed to OCR when its text layer is (nearly) empty and it is
+    mostly image, or when it has no text layer at all.
+    """
+    if char_count >= MIN_TEXT_LAYER_CHARS:
+        return False
+    return char_count == 0 or coverage >= MIN_IMAGE_COVERAGE
+
+
+def ocr_pages(pdf_bytes, page_numbers, poppler_path=None, max_workers=None,
+              memory_ceiling=DEFAULT_OCR_MEMORY_CEILING, stats=None, ocr_backend=DEFAULT_OCR_BACKEND):
+    """
+    OCR the given 1-based page numbers and return {page_number: text}.
+
+    max_workers bounds the process pool (defaults to the number of cores);
+    with a single worker or a single range everything runs in-process.
+    memory_ceiling caps the page bitmaps alive at once across all workers:
+    each worker gets an equal share, and fewer workers are used if a share
+    would be too small to OCR at a useful resolution. ocr_backend names the
+    OCR backend ('auto' prefers the in-process tesserocr engine). If a stats
+    dict is given it is filled with 'workers', 'backend', 'dpi',
+    'peak_raster_bytes' and 'peak_rss_bytes' (the largest RSS of the
+    processes that OCR'd pages, measured during this call).
+    """
+    workers = max_workers or default_ocr_workers()
+    workers = max(1, min(workers, memory_ceiling // MIN_PAGE_RASTER_BYTES))
+    ranges = split_page_ranges(page_numbers, workers)
+    workers = min(workers, len(ranges))
+    max_page_bytes = memory_ceiling // max(workers, 1)
+
+    results = {}
+    range_stats = []
+    if workers <= 1:
+        for first, last in ranges:
+            _, texts, page_stats = _ocr_page_range(pdf_bytes, first, last, poppler_path, max_page_bytes,
+                                                   ocr_backend)
+            results.update(zip(range(first, last + 1), texts))
+            range_stats.append(page_stats)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_ocr_worker,
+                                 initargs=(pdf_bytes, poppler_path, max_page_bytes, ocr_backend)) as pool:
+            futures = [pool.submit(_ocr_page_range_in_worker, first, last) for first, last in ranges]
+            for future in as_completed(futures):
+                first_page, texts, page_stats = future.result()
+                results.update(zip(range(first_page, first_page + len(texts)), texts))
+                range_stats.append(page_stats)
+
+    if stats is not None:
+        stats['workers'] = workers
+        stats['backend'] = ', '.join(sorted(set(page_stats['backend'] for page_stats in range_stats)))
+        stats['dpi'] = sorted(set(dpi for page_stats in range_stats for dpi in page_stats['dpi']))
+        stats['peak_raster_bytes'] = max((page_stats['peak_raster_bytes'] for page_stats in range_stats), default=0)
+        stats['peak_rss_bytes'] = max((page_stats['peak_rss_bytes'] for page_stats in range_stats), default=0)
+    return results
+
+
+def ocr_pdf_pages(pdf_bytes, poppler_path=None, max_workers=None, page_count=None,
+                  memory_ceiling=DEFAULT_OCR_MEMORY_CEILING, stats=None, ocr_backend=DEFAULT_OCR_BACKEND):
+    """OCR every page of a PDF and return a list of page texts in page order"""
+    if page_count is None:
+        page_count = get_page_count(pdf_bytes)
+    results = ocr_pages(pdf_bytes, range(1, page_count + 1), poppler_path, max_workers, memory_ceiling, stats,
+                        ocr_backend)
+    return [results[page] for page in sorted(results)]
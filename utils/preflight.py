@@ -0,0 +1,144 @@
+"""
+Pre-flight inspection of uploads before any text extraction.
+
+Reads only structural metadata (byte size, page count, page boxes, the
+declared width and height of embedded images, zip member sizes) so that
+pathological uploads are handled in milliseconds instead of stalling
+pdfplumber or OCR for minutes. Documents with too many pages are truncated
+to the first pages; oversized files, pages and images are rejected.
+"""
+
+import io
+import zipfile
+
+from .pdf_extraction import sniff_format
+from .pdf_ocr import MAX_OCR_DPI
+
+DEFAULT_PREFLIGHT_BUDGETS = {
+    # Uploads larger than this are rejected
+    'max_bytes': 20 * 1024 * 1024,  # 20 MB
+    # Only the first max_pages pages are analyzed
+    'max_pages': 10,
+    # Largest page (rasterized at MAX_OCR_DPI) or embedded image, in pixels
+    'max_raster_pixels': 50 * 1000 * 1000,
+    # Largest total uncompressed size of a DOCX archive
+    'max_uncompressed_bytes': 100 * 1024 * 1024  # 100 MB
+}
+
+
+def _format_size(num_bytes):
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
+
+
+def _new_report(content):
+    return {
+        'format': sniff_format(content),
+        'bytes': len(content),
+        'page_count': None,
+        'pages_analyzed': None,
+        'truncated': False,
+        'largest_page_pixels': 0,
+        'largest_image_pixels': 0,
+        'rejected': None
+    }
+
+
+def _pdf_image_sizes(resources, seen):
+    """Yield (width, height) of every image XObject reachable from a resource dict"""
+    if not resources:
+        return
+    xobjects = resources.get_object().get('/XObject')
+    if not xobjects:
+        return
+    for reference in xobjects.get_object().values():
+        identity = getattr(reference, 'idnum', None)
+        if identity is not None:
+            if identity in seen:
+                continue
+            seen.add(identity)
+        xobject = reference.get_object()
+        subtype = xobject.get('/Subtype')
+        if subtype == '/Image':
+            yield int(xobject.get('/Width', 0)), int(xobject.get('/Height', 0))
+        elif subtype == '/Form':
+            # Images can be nested inside form XObjects
+            yield from _pdf_image_sizes(xobject.get('/Resources'), seen)
+
+
+def _inspect_pdf(content, budgets, report):
+    import pypdf
+
+    reader = pypdf.PdfReader(io.BytesIO(content))
+    report['page_count'] = len(reader.pages)
+    report['pages_analyzed'] = min(report['page_count'], budgets['max_pages'])
+    report['truncated'] = report['page_count'] > report['pages_analyzed']
+
+    max_pixels = budgets['max_raster_pixels']
+    seen = set()
+    # Pages past the cut are never extracted, so they are not inspected either
+    for page_number in range(1, report['pages_analyzed'] + 1):
+        page = reader.pages[page_number - 1]
+        box = page.mediabox
+        page_pixels = int(float(box.width) * float(box.height) * (MAX_OCR_DPI / 72.0) ** 2)
+        report['largest_page_pixels'] = max(report['largest_page_pixels'], page_pixels)
+        if page_pixels > max_pixels:
+            return (f"Page {page_number} is too large to process "
+                    f"({float(box.width) / 72:.0f} x {float(box.height) / 72:.0f} inches).")
+
+        for width, height in _pdf_image_sizes(page.get('/Resources'), seen):
+            report['largest_image_pixels'] = max(report['largest_image_pixels'], width * height)
+            if width * height > max_pixels:
+                return f"Page {page_number} contains an oversized image ({width} x {height} pixels)."
+    return None
+
+
+def _inspect_docx(content, budgets, report):
+    from PIL import Image
+
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        members = archive.infolist()
+        uncompressed = sum(member.file_size for member in members)
+        if uncompressed > budgets['max_uncompressed_bytes']:
+            return f"Document expands to {_format_size(uncompressed)}, which is too large to process."
+
+        max_pixels = budgets['max_raster_pixels']
+        for member in members:
+            if not member.filename.startswith('word/media/'):
+                continue
+            try:
+                # Only the image header is read; pixels are never decoded
+                with archive.open(member) as f, Image.open(f) as image:
+                    width, height = image.size
+            except Exception:
+                continue
+            report['largest_image_pixels'] = max(report['largest_image_pixels'], width * height)
+            if width * height > max_pixels:
+                return f"Document contains an oversized image ({width} x {height} pixels)."
+    return None
+
+
+def inspect_upload(content, budgets=None):
+    """
+    Inspect upload bytes against the budgets (merged over
+    DEFAULT_PREFLIGHT_BUDGETS) and return a report:
+    {'format', 'bytes', 'page_count', 'pages_analyzed', 'truncated',
+     'largest_page_pixels', 'largest_image_pixels', 'rejected'}
+    where rejected is None or a user-facing reason. page_count and
+    pages_analyzed are only set for PDFs.
+    """
+    budgets = {**DEFAULT_PREFLIGHT_BUDGETS, **(budgets or {})}
+    report = _new_report(content)
+
+    if report['bytes'] > budgets['max_bytes']:
+        report['rejected'] = (f"File is {_format_size(report['bytes'])}; "
+                              f"the limit is {_format_size(budgets['max_bytes'])}.")
+        return report
+
+    try:
+        if report['format'] == 'pdf':
+            report['rejected'] = _inspect_pdf(content, budgets, report)
+        elif report['format'] == 'docx':
+            report['rejected'] = _inspect_docx(content, budgets, report)
+    except Exception as e:
+        report['rejected'] = f"File could not be read: {e}"
+    return report
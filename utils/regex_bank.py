@@ -0,0 +1,62 @@
+"""
+Precompiled regular expressions used by ResumeAnalyzer.
+
+Every pattern is compiled once at import instead of going through the re
+module cache on each call. The entry checks of analyze_resume run over all
+entries of a section joined into one string, which is lowercased once,
+rather than over each entry (and each lowercased copy) separately.
+
+Patterns are kept separate rather than merged into one named-group
+alternation: CPython's regex engine finds a single literal-led pattern much
+faster than it can try five alternatives at every position (see
+`python benchmark.py regex`).
+"""
+
+import re
+
+# Contact details (extract_personal_info)
+EMAIL = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+PHONE = re.compile(r'(\+\d{1,3}[-.]?)?\s*\(?\d{3}\)?[-.]?\s*\d{3}[-.]?\s*\d{4}')
+LINKEDIN = re.compile(r'linkedin\.com/in/[\w-]+')
+GITHUB = re.compile(r'github\.com/[\w-]+')
+
+# Well-formed contact information (check_formatting); any one is enough
+CONTACT_FORMATS = (
+    re.compile(r'\b[\w\.-]+@[\w\.-]+\.\w+\b'),  # email
+    re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),  # phone
+    re.compile(r'linkedin\.com/\w+'),  # LinkedIn
+)
+
+# Contact words that disqualify the opening lines as a summary (extract_summary)
+CONTACT_WORDS = re.compile(r'\b(?:email|phone|address|tel|mobile|linkedin)\b')
+
+# Experience and education entry checks: flag -> (pattern, match lowercased text)
+ENTRY_RULES = {
+    'has_dates': (re.compile(r'\b(?:19|20)\d{2}\b'), False),
+    'has_bullets': (re.compile(r'[•\-\*]'), False),
+    'has_action_verbs': (re.compile(r'\b(?:developed|managed|created|implemented|designed|led|improved)\b'), True),
+    'has_degree': (re.compile(r'\b(?:bachelor|master|phd|b\.|m\.|diploma)\b'), True),
+    'has_gpa': (re.compile(r'\b(?:gpa|cgpa|grade|percentage)\b'), True),
+}
+
+
+def has_contact_format(text):
+    """True if text contains a well-formed email, phone number or LinkedIn URL"""
+    return any(pattern.search(text) for pattern in CONTACT_FORMATS)
+
+
+def scan_entries(entries, flags=tuple(ENTRY_RULES)):
+    """
+    Return {flag: bool} for the requested ENTRY_RULES flags, true if any
+    entry matches. Entries are joined on newlines, which no pattern can
+    match across, so this equals checking each entry on its own.
+    """
+    text = '\n'.join(entries)
+    lowered = None
+    found = {}
+    for flag in flags:
+        pattern, on_lower = ENTRY_RULES[flag]
+        if on_lower and lowered is None:
+            lowered = text.lower()
+        found[flag] = pattern.search(lowered if on_lower else text) is not None
+    return found
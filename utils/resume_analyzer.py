@@ -1,7 +1,40 @@
-import re
+import time
+
+from .batch_analysis import analyze_many
+from . import regex_bank
+from .docx_extraction import DOCX_ENGINE, extract_docx_text
+from .extraction_cache import get_extraction_cache, read_upload_bytes
+from .pdf_extraction import PageText, iter_engine_pages, join_pages, sniff_format
+from .preflight import DEFAULT_PREFLIGHT_BUDGETS, inspect_upload
+from .resume_document import ResumeDocument
+from .role_ranking import get_role_ranker
+from .section_cache import get_section_cache
+from .section_segmenter import ESSENTIAL_SECTIONS, SECTION_KEYWORDS, SectionSegmenter, SegmentedResume
+from .skill_index import get_skill_index
+from .skill_matcher import SkillMatcher, get_skill_matcher
+from .stage_timings import DEFAULT_PROFILE_STAGES, StageTimer
+
 
 class ResumeAnalyzer:
-    def __init__(self):
+    # Bump when extraction output changes so cached text is invalidated
+    PDF_EXTRACTOR_VERSION = 1
+    DOCX_EXTRACTOR_VERSION = 2
+
+    def __init__(self, preflight_budgets=None, pdf_engine='PyPDF2', profile_stages=DEFAULT_PROFILE_STAGES,
+                 incremental=True):
+        # Name of the PDF text engine in pdf_extraction.PDF_TEXT_ENGINES
+        self.pdf_engine = pdf_engine
+        
+        # Record per-stage timings (see utils.stage_timings)
+        self.profile_stages = profile_stages
+        
+        # Reuse results of unchanged sections across analyses (see utils.section_cache)
+        self.section_cache = get_section_cache() if incremental else None
+        
+        # Upload limits checked before extraction (see utils.preflight)
+        self.preflight_budgets = {**DEFAULT_PREFLIGHT_BUDGETS, **(preflight_budgets or {})}
+        self.last_preflight = None
+        
         # Document type indicators
         self.document_types = {
             'resume': [
@@ -22,65 +55,128 @@ class ResumeAnalyzer:
             ]
         }
         
-    def detect_document_type(self, text):
-        text = text.lower()
-        scores = {}
+        # Section keywords are compiled once; a resume section ends at any resume keyword
+        self.section_segmenter = SectionSegmenter(SECTION_KEYWORDS, self.document_types['resume'], ESSENTIAL_SECTIONS)
         
-        # Calculate score for each document type
+    # A streamed document is classified without reading further pages once
+    # its best type scores at least this much
+    EARLY_DECISION_SCORE = 0.3
+
+    def _document_type_scores(self, found, word_count):
+        """Score each document type from the keywords found so far"""
+        scores = {}
         for doc_type, keywords in self.document_types.items():
-            matches = sum(1 for keyword in keywords if keyword in text)
+            matches = len(found[doc_type])
             density = matches / len(keywords)
-            frequency = matches / (len(text.split()) + 1)  # Add 1 to avoid division by zero
+            frequency = matches / (word_count + 1)  # Add 1 to avoid division by zero
             scores[doc_type] = (density * 0.7) + (frequency * 0.3)
+        return scores
+
+    def _find_type_keywords(self, lowered_text, found):
+        """Add the document type keywords present in lowered_text to found"""
+        for doc_type, keywords in self.document_types.items():
+            found[doc_type].update(keyword for keyword in keywords if keyword in lowered_text)
+
+    def detect_document_type(self, text):
+        """
+        Classify text (a string or ResumeDocument) as resume, marksheet,
+        certificate, id_card or unknown. text may also be a page stream from
+        iter_pages(), in which case pages are only read until the type is clear.
+        """
+        if not isinstance(text, (str, ResumeDocument)):
+            doc_type, _ = self.read_pages(text, stop_when_decided=True)
+            return doc_type
+
+        document = ResumeDocument.of(text)
+        found = {doc_type: set() for doc_type in self.document_types}
+        self._find_type_keywords(document.lower_text, found)
+        scores = self._document_type_scores(found, len(document.words))
         
         # Get the highest scoring document type
         best_match = max(scores.items(), key=lambda x: x[1])
         
         # Only return a document type if the score is significant
         return best_match[0] if best_match[1] > 0.15 else 'unknown'
-        
+
+    def read_pages(self, pages, stop_when_decided=False):
+        """
+        Consume a page stream, classifying the document incrementally.
+
+        Returns (doc_type, text). Reading stops early once the document is
+        confidently not a resume (e.g. a marksheet is rejected after page 1),
+        or once any type is certain when stop_when_decided is set; text then
+        only covers the pages read.
+        """
+        found = {doc_type: set() for doc_type in self.document_types}
+        word_count = 0
+        texts = []
+        best_match = ('unknown', 0)
+
+        for page in pages:
+            texts.append(page.text)
+            self._find_type_keywords(page.text.lower(), found)
+            word_count += len(page.text.split())
+
+            scores = self._document_type_scores(found, word_count)
+            best_match = max(scores.items(), key=lambda x: x[1])
+            if best_match[1] >= self.EARLY_DECISION_SCORE and (stop_when_decided or best_match[0] != 'resume'):
+                break
+
+        doc_type = best_match[0] if best_match[1] > 0.15 else 'unknown'
+        return doc_type, "".join(text + "\n" for text in texts)
+
     def calculate_keyword_match(self, resume_text, required_skills):
-        resume_text = resume_text.lower()
-        found_skills = []
-        missing_skills = []
-        
-        for skill in required_skills:
-            skill_lower = skill.lower()
-            # Check for exact match
-            if skill_lower in resume_text:
-                found_skills.append(skill)
-            # Check for partial matches (e.g., "Python" in "Python programming")
-            elif any(skill_lower in phrase for phrase in resume_text.split('.')):
-                found_skills.append(skill)
-            else:
-                missing_skills.append(skill)
-                
-        match_score = (len(found_skills) / len(required_skills)) * 100 if required_skills else 0
+        """
+        Match required skills against the resume on word boundaries in a
+        single pass, also accepting their aliases and small typos (see
+        utils.skill_index)
+        """
+        found = set(get_skill_matcher(required_skills).find_all(resume_text))
+        found |= get_skill_index(required_skills).matched_skills(resume_text, required_skills)
+        return SkillMatcher.keyword_match(found, required_skills)
+
+    def calculate_role_matches(self, resume_text, roles):
+        """
+        Keyword match for several roles at once ({role: required_skills}),
+        all computed from one pass of the skill matcher and skill index
+        """
+        extra_skills = [skill for skills in roles.values() for skill in skills]
+        found = set(get_skill_matcher(extra_skills).find_all(resume_text))
+        found |= get_skill_index(extra_skills).matched_skills(resume_text, extra_skills)
+        return {role: SkillMatcher.keyword_match(found, skills) for role, skills in roles.items()}
         
-        return {
-            'score': match_score,
-            'found_skills': found_skills,
-            'missing_skills': missing_skills
-        }
+    def analyze_many(self, documents, job_requirements, workers=None, chunk_size=None, as_dataframe=False,
+                     on_result=None):
+        """
+        Score many resumes (strings, ResumeDocuments or {'raw_text': ...})
+        against one role over a process pool of `workers` processes. Returns
+        columnar output named after the resume_analysis table; see
+        utils.batch_analysis.analyze_many.
+        """
+        return analyze_many(documents, job_requirements, workers, chunk_size, as_dataframe, on_result, analyzer=self)
+
+    def rank_roles(self, resume_text, top_k=5):
+        """
+        Best-fitting roles across all of JOB_ROLES, scored in one vectorized
+        pass: [{'category', 'role', 'score', 'found_skills', 'missing_skills'}]
+        """
+        return get_role_ranker().rank(resume_text, top_k)
         
     def check_resume_sections(self, text):
-        text = text.lower()
-        essential_sections = {
-            'contact': ['email', 'phone', 'address', 'linkedin'],
-            'education': ['education', 'university', 'college', 'degree', 'academic'],
-            'experience': ['experience', 'work', 'employment', 'job', 'internship'],
-            'skills': ['skills', 'technologies', 'tools', 'proficiencies', 'expertise']
-        }
+        """Score 0-100 from the essential section keywords present (text or its SegmentedResume)"""
+        found_keywords = self.segment(text).keywords
         
         section_scores = {}
-        for section, keywords in essential_sections.items():
-            found = sum(1 for keyword in keywords if keyword in text)
+        for section, keywords in ESSENTIAL_SECTIONS.items():
+            found = sum(1 for keyword in keywords if keyword in found_keywords[section])
             section_scores[section] = min(25, (found / len(keywords)) * 25)
             
         return sum(section_scores.values())
         
     def check_formatting(self, text):
-        lines = text.split('\n')
+        document = ResumeDocument.of(text)
+        text = document.text
+        lines = document.lines
         score = 100
         deductions = []
         
@@ -105,73 +201,95 @@ class ResumeAnalyzer:
             score -= 15
             deductions.append("Inconsistent spacing between sections")
             
-        # Check for contact information format
-        contact_patterns = [
-            r'\b[\w\.-]+@[\w\.-]+\.\w+\b',  # email
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # phone
-            r'linkedin\.com/\w+',  # LinkedIn
-        ]
-        if not any(re.search(pattern, text) for pattern in contact_patterns):
+        # Check for contact information format (email, phone or LinkedIn)
+        if not regex_bank.has_contact_format(text):
             score -= 15
             deductions.append("Missing or improperly formatted contact information")
             
         return max(0, score), deductions
         
+    def stage_timer(self):
+        """StageTimer for one call; does nothing unless self.profile_stages is set"""
+        return StageTimer('ResumeAnalyzer', self.profile_stages)
+
+    def preflight(self, file_content):
+        """
+        Inspect upload bytes against self.preflight_budgets before extraction.
+        Returns the preflight report (also kept on self.last_preflight) and
+        raises if the upload is rejected.
+        """
+        report = inspect_upload(file_content, self.preflight_budgets)
+        self.last_preflight = report
+        if report['rejected']:
+            raise Exception(report['rejected'])
+        return report
+
     def extract_text_from_pdf(self, file):
         try:
-            import PyPDF2
-            import io
-            
-            # Create a PDF reader object
-            # First make sure we have the file content as bytes
-            if hasattr(file, 'read'):
-                # If it's already a file-like object, read it
-                file_content = file.read()
-                file.seek(0)  # Reset file pointer
-            else:
-                # If it's already bytes
-                file_content = file
-                
-            # Create BytesIO from bytes content
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-            
-            # Extract text from all pages
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-                
+            timer = self.stage_timer()
+            # Make sure we have the file content as bytes
+            file_content = read_upload_bytes(file)
+            # Only the first pages_analyzed pages are extracted
+            max_pages = self.preflight(file_content)['pages_analyzed']
+            text = get_extraction_cache().get_or_extract(
+                file_content, 'ResumeAnalyzer.pdf', self.PDF_EXTRACTOR_VERSION,
+                lambda content: self._extract_pdf_text(content, max_pages), parts=(self.pdf_engine, max_pages)
+            )
+            timer.lap('extraction', len(file_content))
             return text
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
+
+    def _extract_pdf_text(self, file_content, max_pages=None):
+        """Extract text from PDF bytes with self.pdf_engine (uncached)"""
+        return join_pages(iter_engine_pages(file_content, self.pdf_engine, max_pages))
+
+    def iter_pages(self, file):
+        """
+        Yield a PageText for each page of an upload as soon as it is parsed.
+        DOCX files have no pages and are yielded as a single page. Uploads
+        are checked by preflight() first and long PDFs are truncated.
+        """
+        file_content = read_upload_bytes(file)
+        if sniff_format(file_content) == 'docx':
+            start = time.perf_counter()
+            text = self.extract_text_from_docx(file_content)
+            yield PageText(1, text, DOCX_ENGINE, time.perf_counter() - start)
+            return
+        max_pages = self.preflight(file_content)['pages_analyzed']
+        yield from iter_engine_pages(file_content, self.pdf_engine, max_pages)
             
     def extract_text_from_docx(self, docx_file):
         """Extract text from a DOCX file"""
         try:
-            from docx import Document
-            doc = Document(docx_file)
-            full_text = []
-            for paragraph in doc.paragraphs:
-                full_text.append(paragraph.text)
-            return '\n'.join(full_text)
+            timer = self.stage_timer()
+            file_content = read_upload_bytes(docx_file)
+            self.preflight(file_content)
+            text = get_extraction_cache().get_or_extract(
+                file_content, 'ResumeAnalyzer.docx', self.DOCX_EXTRACTOR_VERSION, self._extract_docx_text
+            )
+            timer.lap('extraction', len(file_content))
+            return text
         except Exception as e:
             raise Exception(f"Error extracting text from DOCX file: {str(e)}")
 
+    def _extract_docx_text(self, file_content):
+        """Extract text (paragraphs and tables) from DOCX bytes by streaming document.xml (uncached)"""
+        return extract_docx_text(file_content)
+
     def extract_personal_info(self, text):
-        """Extract personal information from resume text"""
-        # Basic patterns for personal info
-        email_pattern = r'[\w\.-]+@[\w\.-]+\.\w+'
-        phone_pattern = r'(\+\d{1,3}[-.]?)?\s*\(?\d{3}\)?[-.]?\s*\d{3}[-.]?\s*\d{4}'
-        linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-        github_pattern = r'github\.com/[\w-]+'
+        """Extract personal information from resume text (or its ResumeDocument)"""
+        document = ResumeDocument.of(text)
+        text = document.text
         
         # Extract information
-        email = re.search(email_pattern, text)
-        phone = re.search(phone_pattern, text)
-        linkedin = re.search(linkedin_pattern, text)
-        github = re.search(github_pattern, text)
+        email = regex_bank.EMAIL.search(text)
+        phone = regex_bank.PHONE.search(text)
+        linkedin = regex_bank.LINKEDIN.search(text)
+        github = regex_bank.GITHUB.search(text)
         
         # Get the first line as name (basic assumption)
-        name = text.split('\n')[0].strip()
+        name = document.lines[0].strip()
         
         return {
             'name': name if len(name) > 0 else 'Unknown',
@@ -182,194 +300,33 @@ class ResumeAnalyzer:
             'portfolio': ''  # Can be enhanced later
         }
 
+    def segment(self, text):
+        """Section map of text or a ResumeDocument (a SegmentedResume is returned unchanged)"""
+        if isinstance(text, SegmentedResume):
+            return text
+        return ResumeDocument.of(text).segments(self.section_segmenter)
+
     def extract_education(self, text):
-        """Extract education information from resume text"""
-        education = []
-        lines = text.split('\n')
-        education_keywords = [
-            'education', 'academic', 'qualification', 'degree', 'university', 'college',
-            'school', 'institute', 'certification', 'diploma', 'bachelor', 'master',
-            'phd', 'b.tech', 'm.tech', 'b.e', 'm.e', 'b.sc', 'm.sc','bca', 'mca', 'b.com',
-            'm.com', 'b.cs-it', 'imca', 'bba', 'mba', 'honors', 'scholarship'
-        ]
-        in_education_section = False
-        current_entry = []
-
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in education_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in education_keywords):
-                    # This line contains education info, not just a header
-                    current_entry.append(line)
-                in_education_section = True
-                continue
-            
-            if in_education_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(edu_key.lower() in line.lower() for edu_key in education_keywords):
-                        in_education_section = False
-                        if current_entry:
-                            education.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    education.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            education.append(' '.join(current_entry))
-        
-        return education
+        """Extract education information from resume text (or its SegmentedResume)"""
+        return list(self.segment(text).entries['education'])
 
     def extract_experience(self, text):
-        """Extract work experience information from resume text"""
-        experience = []
-        lines = text.split('\n')
-        experience_keywords = [
-            'experience', 'employment', 'work history', 'professional experience',
-            'work experience', 'career history', 'professional background',
-            'employment history', 'job history', 'positions held', 'experience',
-            'job title', 'job responsibilities', 'job description', 'job summary'
-        ]
-        in_experience_section = False
-        current_entry = []
-
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in experience_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in experience_keywords):
-                    # This line contains experience info, not just a header
-                    current_entry.append(line)
-                in_experience_section = True
-                continue
-            
-            if in_experience_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(exp_key.lower() in line.lower() for exp_key in experience_keywords):
-                        in_experience_section = False
-                        if current_entry:
-                            experience.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    experience.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            experience.append(' '.join(current_entry))
-        
-        return experience
+        """Extract work experience information from resume text (or its SegmentedResume)"""
+        return list(self.segment(text).entries['experience'])
 
     def extract_projects(self, text):
-        """Extract project information from resume text"""
-        projects = []
-        lines = text.split('\n')
-        project_keywords = [
-            'projects', 'personal projects', 'academic projects', 'key projects',
-            'major projects', 'professional projects', 'project experience',
-            'relevant projects', 'featured projects','latest projects',
-            'top projects'
-        ]
-        in_project_section = False
-        current_entry = []
-
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in project_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in project_keywords):
-                    # This line contains project info, not just a header
-                    current_entry.append(line)
-                in_project_section = True
-                continue
-            
-            if in_project_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(proj_key.lower() in line.lower() for proj_key in project_keywords):
-                        in_project_section = False
-                        if current_entry:
-                            projects.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    projects.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            projects.append(' '.join(current_entry))
-        
-        return projects
+        """Extract project information from resume text (or its SegmentedResume)"""
+        return list(self.segment(text).entries['projects'])
 
     def extract_skills(self, text):
-        """Extract skills from resume text"""
+        """Extract skills from resume text (or its SegmentedResume)"""
         skills = set()  # Use set to avoid duplicates
-        lines = text.split('\n')
-        skills_keywords = [
-            'skills', 'technical skills', 'competencies', 'expertise',
-            'core competencies', 'professional skills', 'key skills',
-            'technical expertise', 'proficiencies', 'qualifications',
-            'top skills', 'key skill', 'major skill', 'personal skill',
-            'soft skills', 'soft skill', 'soft skillset'
-        ]
-        in_skills_section = False
-        current_entry = []
 
         # Common skill separators
         separators = [',', '•', '|', '/', '\\', '·', '>', '-', '–', '―']
 
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in skills_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in skills_keywords):
-                    # This line contains skills, not just a header
-                    current_entry.append(line)
-                in_skills_section = True
-                continue
-            
-            if in_skills_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(skill_key.lower() in line.lower() for skill_key in skills_keywords):
-                        in_skills_section = False
-                        if current_entry:
-                            # Process the current entry
-                            text_to_process = ' '.join(current_entry)
-                            # Split by common separators
-                            for separator in separators:
-                                if separator in text_to_process:
-                                    skills.update(skill.strip() for skill in text_to_process.split(separator) if skill.strip())
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    # Process the current entry
-                    text_to_process = ' '.join(current_entry)
-                    # Split by common separators
-                    for separator in separators:
-                        if separator in text_to_process:
-                            skills.update(skill.strip() for skill in text_to_process.split(separator) if skill.strip())
-                    current_entry = []
-        
-        if current_entry:
-            # Process any remaining skills
-            text_to_process = ' '.join(current_entry)
+        for text_to_process in self.segment(text).entries['skills']:
+            # Split by common separators
             for separator in separators:
                 if separator in text_to_process:
                     skills.update(skill.strip() for skill in text_to_process.split(separator) if skill.strip())
@@ -377,107 +334,171 @@ class ResumeAnalyzer:
         return list(skills)
 
     def extract_summary(self, text):
-        """Extract summary/objective from resume text"""
+        """Extract summary/objective from resume text (or its SegmentedResume)"""
+        segments = self.segment(text)
         summary = []
-        lines = text.split('\n')
-        summary_keywords = [
-            'summary', 'professional summary', 'career summary', 'objective',
-            'career objective', 'professional objective', 'about me', 'profile',
-            'professional profile', 'career profile', 'overview', 'skill summary'
-        ]
-        in_summary_section = False
-        current_entry = []
-
-        # Try to find summary at the beginning of the resume
-        start_index = 0
-        while start_index < min(10, len(lines)) and not lines[start_index].strip():
-            start_index += 1
 
         # Check first few non-empty lines for potential summary
-        first_lines = []
-        lines_checked = 0
-        for line in lines[start_index:]:
-            if line.strip():
-                first_lines.append(line.strip())
-                lines_checked += 1
-                if lines_checked >= 5:  # Check first 5 non-empty lines
-                    break
+        first_lines = [index for index, line in enumerate(segments.lines) if line][:5]
 
         # If first few lines look like a summary (no special formatting, no contact info)
-        if first_lines and not any(keyword in first_lines[0].lower() for keyword in summary_keywords):
-            potential_summary = ' '.join(first_lines)
+        if first_lines and not any(keyword in segments.lowered[first_lines[0]]
+                                   for keyword in SECTION_KEYWORDS['summary']):
+            potential_summary = ' '.join(segments.lines[index] for index in first_lines)
             if len(potential_summary.split()) > 10:  # More than 10 words
-                if not re.search(r'\b(?:email|phone|address|tel|mobile|linkedin)\b', potential_summary.lower()):
+                if not regex_bank.CONTACT_WORDS.search(potential_summary.lower()):
                     summary.append(potential_summary)
 
-        # Look for explicitly marked summary section
-        for line in lines:
-            line = line.strip()
-            # Check for section header
-            if any(keyword.lower() in line.lower() for keyword in summary_keywords):
-                if not any(keyword.lower() == line.lower() for keyword in summary_keywords):
-                    # This line contains summary info, not just a header
-                    current_entry.append(line)
-                in_summary_section = True
-                continue
-            
-            if in_summary_section:
-                # Check if we've hit another section
-                if line and any(keyword.lower() in line.lower() for keyword in self.document_types['resume']):
-                    if not any(sum_key.lower() in line.lower() for sum_key in summary_keywords):
-                        in_summary_section = False
-                        if current_entry:
-                            summary.append(' '.join(current_entry))
-                            current_entry = []
-                        continue
-                
-                if line:
-                    current_entry.append(line)
-                elif current_entry:  # Empty line and we have content
-                    summary.append(' '.join(current_entry))
-                    current_entry = []
-        
-        if current_entry:
-            summary.append(' '.join(current_entry))
+        # Explicitly marked summary sections
+        summary.extend(segments.entries['summary'])
         
         return ' '.join(summary) if summary else ''
 
+    def _memoized(self, component, body, compute_fn, reused_sections, parts=()):
+        """compute_fn() through the section cache, noting component in reused_sections on a hit"""
+        if self.section_cache is None:
+            return compute_fn()
+        value, reused = self.section_cache.get_or_compute(component, body, compute_fn, parts)
+        if reused:
+            reused_sections.append(component)
+        return value
+
+    def _section_blocks(self, segments):
+        """The text cut at every section header line into consecutive blocks covering all of it"""
+        starts = sorted({0} | {segments.line_offsets[section['header_line']]
+                               for sections in segments.sections.values() for section in sections})
+        ends = starts[1:] + [len(segments.text)]
+        return [segments.text[start:end] for start, end in zip(starts, ends)]
+
+    def _keyword_match_by_section(self, segments, required_skills, reused_sections):
+        """
+        calculate_keyword_match() over the whole text, assembled from the
+        required skills found in each section block. No skill spans a line
+        break, so this equals one pass over the text; blocks analyzed before
+        are not scanned again.
+        """
+        if self.section_cache is None:
+            return self.calculate_keyword_match(segments.text, required_skills)
+        matcher = get_skill_matcher(required_skills)
+        index = get_skill_index(required_skills)
+        required = sorted({skill.strip().lower() for skill in required_skills})
+
+        def block_skills(block):
+            found = set(matcher.find_all(block)).intersection(required)
+            return tuple(found | index.matched_skills(block, required_skills))
+
+        found = set()
+        all_reused = True
+        for block in self._section_blocks(segments):
+            patterns, reused = self.section_cache.get_or_compute(
+                'skills', block, lambda: block_skills(block), parts=(required,)
+            )
+            found.update(patterns)
+            all_reused = all_reused and reused
+        if all_reused:
+            reused_sections.append('skills')
+        return matcher.keyword_match(found, required_skills)
+
+    def _summary_suggestions(self, summary):
+        suggestions = []
+        if not summary:
+            suggestions.append("Add a professional summary to highlight your key qualifications")
+        elif len(summary.split()) < 30:
+            suggestions.append("Expand your professional summary to better highlight your experience and goals")
+        elif len(summary.split()) > 100:
+            suggestions.append("Consider making your summary more concise (aim for 50-75 words)")
+        return tuple(suggestions)
+
+    def _experience_suggestions(self, experience):
+        suggestions = []
+        if not experience:
+            suggestions.append("Add your work experience section")
+        else:
+            flags = regex_bank.scan_entries(experience, ('has_dates', 'has_bullets', 'has_action_verbs'))
+
+            if not flags['has_dates']:
+                suggestions.append("Include dates for each work experience")
+            if not flags['has_bullets']:
+                suggestions.append("Use bullet points to list your achievements and responsibilities")
+            if not flags['has_action_verbs']:
+                suggestions.append("Start bullet points with strong action verbs")
+        return tuple(suggestions)
+
+    def _education_suggestions(self, education, require_gpa):
+        suggestions = []
+        if not education:
+            suggestions.append("Add your educational background")
+        else:
+            flags = regex_bank.scan_entries(education, ('has_dates', 'has_degree', 'has_gpa'))
+
+            if not flags['has_dates']:
+                suggestions.append("Include graduation dates")
+            if not flags['has_degree']:
+                suggestions.append("Specify your degree type")
+            if not flags['has_gpa'] and require_gpa:
+                suggestions.append("Include your GPA if it's above 3.0")
+        return tuple(suggestions)
+
     def analyze_resume(self, resume_data, job_requirements):
-        """Analyze resume and return scores and recommendations"""
+        """
+        Analyze resume and return scores and recommendations. raw_text may be
+        a string or a ResumeDocument; every stage reads the same document.
+        With profile_stages set, the result has a 'timings' block with the
+        duration and input size of each stage. Section-level results are
+        memoized by section body, and reused_sections lists the components
+        (skills, summary, experience, education) taken from that cache.
+        """
+        timer = self.stage_timer()
         try:
-            text = resume_data.get('raw_text', '')
+            if 'pages' in resume_data:
+                # Page stream from iter_pages(): non-resumes are rejected
+                # without reading the remaining pages
+                doc_type, text = self.read_pages(resume_data['pages'])
+                text = ResumeDocument(text)
+                timer.lap('extraction', len(text))
+            else:
+                text = ResumeDocument.of(resume_data.get('raw_text', ''))
+                doc_type = self.detect_document_type(text)
+                timer.lap('document_type', len(text))
             
             # Extract personal information
             personal_info = self.extract_personal_info(text)
+            timer.lap('personal_info', len(text))
             
-            # First detect document type
-            doc_type = self.detect_document_type(text)
+            # Only resumes get an ATS analysis
             if doc_type != 'resume':
-                return {
+                return timer.finish({
                     'ats_score': 0,
                     'document_type': doc_type,
                     'keyword_match': {'score': 0, 'found_skills': [], 'missing_skills': []},
                     'section_score': 0,
                     'format_score': 0,
                     'suggestions': [f"This appears to be a {doc_type} document. Please upload a resume for ATS analysis."]
-                }
+                })
                 
-            # Calculate keyword match
-            required_skills = job_requirements.get('required_skills', [])
-            keyword_match = self.calculate_keyword_match(text, required_skills)
-            
-            # Extract all resume sections
-            education = self.extract_education(text)
-            experience = self.extract_experience(text)
-            projects = self.extract_projects(text)
-            skills = list(self.extract_skills(text))  # Convert skills set to list
-            summary = self.extract_summary(text)
+            # Segment the resume once; every extractor reads the same section map
+            segments = self.segment(text)
+            education = self.extract_education(segments)
+            experience = self.extract_experience(segments)
+            projects = self.extract_projects(segments)
+            skills = list(self.extract_skills(segments))  # Convert skills set to list
+            summary = self.extract_summary(segments)
             
             # Check resume sections
-            section_score = self.check_resume_sections(text)
+            section_score = self.check_resume_sections(segments)
+            timer.lap('sections', len(segments.lines))
+            
+            # Components whose cached result was reused because their section is unchanged
+            reused_sections = []
+            
+            # Calculate keyword match
+            required_skills = job_requirements.get('required_skills', [])
+            keyword_match = self._keyword_match_by_section(segments, required_skills, reused_sections)
+            timer.lap('keyword_match', len(text))
             
             # Check formatting
             format_score, format_deductions = self.check_formatting(text)
+            timer.lap('formatting', len(text))
             
             # Generate section-specific suggestions
             contact_suggestions = []
@@ -488,13 +509,8 @@ class ResumeAnalyzer:
             if not personal_info.get('linkedin'):
                 contact_suggestions.append("Add your LinkedIn profile URL")
             
-            summary_suggestions = []
-            if not summary:
-                summary_suggestions.append("Add a professional summary to highlight your key qualifications")
-            elif len(summary.split()) < 30:
-                summary_suggestions.append("Expand your professional summary to better highlight your experience and goals")
-            elif len(summary.split()) > 100:
-                summary_suggestions.append("Consider making your summary more concise (aim for 50-75 words)")
+            summary_suggestions = list(self._memoized('summary', summary, lambda: self._summary_suggestions(summary),
+                                                      reused_sections))
             
             skills_suggestions = []
             if not skills:
@@ -504,44 +520,20 @@ class ResumeAnalyzer:
             if keyword_match['score'] < 70:
                 skills_suggestions.append("Add more skills that match the job requirements")
             
-            experience_suggestions = []
-            if not experience:
-                experience_suggestions.append("Add your work experience section")
-            else:
-                has_dates = any(re.search(r'\b(19|20)\d{2}\b', exp) for exp in experience)
-                has_bullets = any(re.search(r'[•\-\*]', exp) for exp in experience)
-                has_action_verbs = any(re.search(r'\b(developed|managed|created|implemented|designed|led|improved)\b', 
-                                               exp.lower()) for exp in experience)
-                
-                if not has_dates:
-                    experience_suggestions.append("Include dates for each work experience")
-                if not has_bullets:
-                    experience_suggestions.append("Use bullet points to list your achievements and responsibilities")
-                if not has_action_verbs:
-                    experience_suggestions.append("Start bullet points with strong action verbs")
+            experience_suggestions = list(self._memoized('experience', '\n'.join(experience),
+                                                         lambda: self._experience_suggestions(experience),
+                                                         reused_sections))
             
-            education_suggestions = []
-            if not education:
-                education_suggestions.append("Add your educational background")
-            else:
-                has_dates = any(re.search(r'\b(19|20)\d{2}\b', edu) for edu in education)
-                has_degree = any(re.search(r'\b(bachelor|master|phd|b\.|m\.|diploma)\b', 
-                                         edu.lower()) for edu in education)
-                has_gpa = any(re.search(r'\b(gpa|cgpa|grade|percentage)\b', 
-                                      edu.lower()) for edu in education)
-                
-                if not has_dates:
-                    education_suggestions.append("Include graduation dates")
-                if not has_degree:
-                    education_suggestions.append("Specify your degree type")
-                if not has_gpa and job_requirements.get('require_gpa', False):
-                    education_suggestions.append("Include your GPA if it's above 3.0")
+            require_gpa = bool(job_requirements.get('require_gpa', False))
+            education_suggestions = list(self._memoized('education', '\n'.join(education),
+                                                        lambda: self._education_suggestions(education, require_gpa),
+                                                        reused_sections, parts=(require_gpa,)))
             
             format_suggestions = []
             if format_score < 100:
                 format_suggestions.extend(format_deductions)
             
-            # Calculate section-specific scores
+            # Calculate section-specific scores (cached suggestions give the same component scores)
             contact_score = 100 - (len(contact_suggestions) * 25)  # -25 for each missing item
             summary_score = 100 - (len(summary_suggestions) * 33)  # -33 for each issue
             skills_score = keyword_match['score']
@@ -569,9 +561,10 @@ class ResumeAnalyzer:
             
             if not suggestions:
                 suggestions.append("Your resume is well-optimized for ATS systems")
+            timer.lap('scoring', len(experience) + len(education))
             
             # Return final structured result
-            return {
+            return timer.finish({
                 **personal_info,  # Include extracted personal info
                 'ats_score': ats_score,
                 'document_type': 'resume',
@@ -590,6 +583,7 @@ class ResumeAnalyzer:
                 'experience_suggestions': experience_suggestions,
                 'education_suggestions': education_suggestions,
                 'format_suggestions': format_suggestions,
+                'reused_sections': reused_sections,
                 'section_scores': {
                     'contact': contact_score,
                     'summary': summary_score,
@@ -598,13 +592,13 @@ class ResumeAnalyzer:
                     'education': education_score,
                     'format': format_score
                 }
-            }
+            })
         except Exception as e:
             import traceback
             print(f"Error analyzing resume: {str(e)}")
             print(traceback.format_exc())
             # Return a default error response
-            return {
+            return timer.finish({
                 'error': f"Resume analysis failed: {str(e)}",
                 'ats_score': 0,
                 'document_type': 'unknown',
@@ -612,4 +606,4 @@ class ResumeAnalyzer:
                 'section_score': 0,
                 'format_score': 0,
                 'suggestions': [f"Error analyzing resume: {str(e)}. Please check your file and try again."]
-            }
\ No newline at end of file
+            })
\ No newline at end of file
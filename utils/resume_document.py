@@ -0,0 +1,109 @@
+"""
+Preprocessed resume text shared by every analyzer.
+
+A ResumeDocument is created once per upload and passed through the pipeline
+in place of the raw string. Each derived view (normalized and lowercase
+text, lines, word tokens, sentence spans, content hash, section map) is
+computed on first access and cached on the object, so no analyzer repeats
+work another one already did. __slots__ keeps the per-session footprint to
+the views actually used.
+"""
+
+import re
+import unicodedata
+
+from .extraction_cache import content_hash
+
+# A sentence runs up to terminal punctuation or the end of its line
+_SENTENCE = re.compile(r'[^.!?\n]+(?:[.!?]+|$)', re.MULTILINE)
+# Control characters other than newline and tab
+_CONTROL = re.compile(r'[\x00-\x08\x0b-\x1f\x7f]')
+
+
+class ResumeDocument:
+    """Raw resume text plus lazily computed, cached views of it"""
+
+    __slots__ = (
+        'text', '_normalized_text', '_lower_text', '_lines', '_words',
+        '_sentence_spans', '_content_hash', '_segments'
+    )
+
+    def __init__(self, text):
+        self.text = text or ''
+        self._normalized_text = None
+        self._lower_text = None
+        self._lines = None
+        self._words = None
+        self._sentence_spans = None
+        self._content_hash = None
+        self._segments = None
+
+    @classmethod
+    def of(cls, text):
+        """Return text itself if it already is a ResumeDocument, else wrap it"""
+        return text if isinstance(text, cls) else cls(text)
+
+    def __str__(self):
+        return self.text
+
+    def __len__(self):
+        return len(self.text)
+
+    @property
+    def normalized_text(self):
+        """NFKC-normalized text with unified line endings and no control characters"""
+        if self._normalized_text is None:
+            text = unicodedata.normalize('NFKC', self.text).replace('\r\n', '\n').replace('\r', '\n')
+            self._normalized_text = _CONTROL.sub('', text).strip()
+        return self._normalized_text
+
+    @property
+    def lower_text(self):
+        """Lowercase raw text (offsets match self.text for ASCII input)"""
+        if self._lower_text is None:
+            self._lower_text = self.text.lower()
+        return self._lower_text
+
+    @property
+    def lines(self):
+        """Raw text split on newlines"""
+        if self._lines is None:
+            self._lines = self.text.split('\n')
+        return self._lines
+
+    @property
+    def words(self):
+        """Whitespace-separated tokens of the raw text"""
+        if self._words is None:
+            self._words = self.text.split()
+        return self._words
+
+    @property
+    def sentence_spans(self):
+        """(start, end) offsets of each sentence or sentence-like line in the raw text"""
+        if self._sentence_spans is None:
+            spans = []
+            for match in _SENTENCE.finditer(self.text):
+                start, end = match.span()
+                # Trim surrounding whitespace from the span
+                while start < end and self.text[start].isspace():
+                    start += 1
+                while end > start and self.text[end - 1].isspace():
+                    end -= 1
+                if start < end:
+                    spans.append((start, end))
+            self._sentence_spans = spans
+        return self._sentence_spans
+
+    @property
+    def content_hash(self):
+        """SHA-256 of the normalized text, stable across line-ending and Unicode form changes"""
+        if self._content_hash is None:
+            self._content_hash = content_hash(self.normalized_text.encode('utf-8'))
+        return self._content_hash
+
+    def segments(self, segmenter):
+        """Section map of the text from segmenter (a SectionSegmenter), cached per segmenter"""
+        if self._segments is None or self._segments[0] is not segmenter:
+            self._segments = (segmenter, segmenter.segment(self.text, self.lines))
+        return self._segments[1]
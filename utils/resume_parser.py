@@ -1,44 +1,32 @@
-import pypdf
-import docx
 import re
-from io import BytesIO
+
+from .docx_extraction import extract_docx_text
+from .extraction_cache import get_extraction_cache, read_upload_bytes
+from .pdf_extraction import iter_engine_pages, join_pages
 
 class ResumeParser:
-    def __init__(self):
-        pass
+    # Bump when extraction output changes so cached text is invalidated
+    EXTRACTOR_VERSION = 2
+
+    def __init__(self, pdf_engine='pypdf'):
+        # Name of the PDF text engine in pdf_extraction.PDF_TEXT_ENGINES
+        self.pdf_engine = pdf_engine
         
     def extract_text_from_pdf(self, pdf_file):
         try:
-            # Handle different file input types
-            if hasattr(pdf_file, 'read'):
-                # If it's a file-like object
-                file_content = pdf_file.read()
-                pdf_file.seek(0)  # Reset file pointer
-            else:
-                # If it's already bytes
-                file_content = pdf_file
-                
-            pdf_reader = pypdf.PdfReader(BytesIO(file_content))
-            text = ""
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-                else:
-                    # Handle empty page text
-                    text += "\n"
-            return text.strip()
+            # Empty pages still contribute their newline
+            return join_pages(self.iter_pages(pdf_file)).strip()
         except Exception as e:
             print(f"Error extracting text from PDF: {e}")
             return ""
             
+    def iter_pages(self, pdf_file):
+        """Yield a PageText for each PDF page as soon as it is parsed"""
+        yield from iter_engine_pages(read_upload_bytes(pdf_file), self.pdf_engine)
+            
     def extract_text_from_docx(self, docx_file):
         try:
-            doc = docx.Document(BytesIO(docx_file.read()))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            return extract_docx_text(read_upload_bytes(docx_file)).strip()
         except Exception as e:
             print(f"Error extracting text from DOCX: {e}")
             return ""
@@ -48,11 +36,15 @@ class ResumeParser:
         file.seek(0)
         
         if file.name.endswith('.pdf'):
-            return self.extract_text_from_pdf(file)
+            extractor, extract_fn = f'ResumeParser.pdf.{self.pdf_engine}', self.extract_text_from_pdf
         elif file.name.endswith('.docx'):
-            return self.extract_text_from_docx(file)
+            extractor, extract_fn = 'ResumeParser.docx', self.extract_text_from_docx
         else:
             return ""
+
+        return get_extraction_cache().get_or_extract(
+            read_upload_bytes(file), extractor, self.EXTRACTOR_VERSION, extract_fn
+        )
             
     def parse(self, file):
         text = self.extract_text(file)
@@ -0,0 +1,104 @@
+"""
+Best-fit role ranking.
+
+A role x skill incidence matrix is built once from config.job_roles.JOB_ROLES
+over the shared skill matcher's vocabulary. Ranking a resume then takes one
+skill-matcher pass (plus the skill index, for aliases and typos, as in
+ResumeAnalyzer.calculate_keyword_match) to turn the resume into a skill
+vector and a single matrix product to score every role, instead of
+re-running the analyzer per role.
+"""
+
+import threading
+
+import numpy as np
+
+from .skill_index import get_skill_index
+from .skill_matcher import get_skill_matcher, iter_job_roles
+
+
+class RoleRanker:
+    """Scores a resume against every role at once"""
+
+    def __init__(self, job_roles=None, matcher=None):
+        self.matcher = matcher or get_skill_matcher()
+        self.roles = []            # (category, role) per matrix row
+        self.role_skills = []      # Required skills per row, as written in JOB_ROLES
+        self._skill_columns = {pattern: column for column, pattern in enumerate(self.matcher.patterns)}
+        # Columns of each canonical skill, for alias and typo hits of the skill index
+        self.index = get_skill_index(self.matcher.patterns)
+        self._canonical_columns = {}
+        for pattern, column in self._skill_columns.items():
+            self._canonical_columns.setdefault(self.index.canonical(pattern), []).append(column)
+
+        for category, role, role_info in iter_job_roles(job_roles):
+            self.roles.append((category, role))
+            self.role_skills.append(list(role_info.get('required_skills', [])))
+
+        self.matrix = np.zeros((len(self.roles), len(self._skill_columns)), dtype=np.float32)
+        for row, skills in enumerate(self.role_skills):
+            for skill in skills:
+                column = self._skill_columns.get(skill.strip().lower())
+                if column is not None:
+                    self.matrix[row, column] = 1.0
+        # Skills missing from the matcher vocabulary still count as required
+        self.required_counts = np.array([len(skills) for skills in self.role_skills], dtype=np.float32)
+
+    def skill_vector(self, text):
+        """0/1 vector over the matcher vocabulary of the skills found in text, directly or by alias or typo"""
+        vector = np.zeros(len(self._skill_columns), dtype=np.float32)
+        columns = [self._skill_columns[pattern] for pattern in self.matcher.find_all(text)]
+        columns += [column for key in self.index.find(text) for column in self._canonical_columns.get(key, ())]
+        vector[columns] = 1.0
+        return vector
+
+    def _scores(self, vector):
+        found_counts = self.matrix @ vector
+        return np.divide(found_counts * 100, self.required_counts,
+                         out=np.zeros_like(found_counts), where=self.required_counts > 0)
+
+    def scores(self, text):
+        """Keyword match score (0-100) of text for every role, in self.roles order"""
+        return self._scores(self.skill_vector(text))
+
+    def rank(self, text, top_k=5):
+        """
+        Return the top_k best-fitting roles as dicts with category, role,
+        score, found_skills and missing_skills, best first.
+        """
+        vector = self.skill_vector(text)
+        scores = self._scores(vector)
+        # Stable sort keeps JOB_ROLES order among equal scores
+        order = np.argsort(-scores, kind='stable')[:top_k]
+
+        ranking = []
+        for row in order:
+            found_skills, missing_skills = [], []
+            for skill in self.role_skills[row]:
+                column = self._skill_columns.get(skill.strip().lower())
+                if column is not None and vector[column]:
+                    found_skills.append(skill)
+                else:
+                    missing_skills.append(skill)
+            category, role = self.roles[row]
+            ranking.append({
+                'category': category,
+                'role': role,
+                'score': float(scores[row]),
+                'found_skills': found_skills,
+                'missing_skills': missing_skills
+            })
+        return ranking
+
+
+_shared_ranker = None
+_ranker_lock = threading.Lock()
+
+
+def get_role_ranker():
+    """Return the process-wide ranker built from JOB_ROLES"""
+    global _shared_ranker
+    with _ranker_lock:
+        if _shared_ranker is None:
+            _shared_ranker = RoleRanker()
+        return _shared_ranker
@@ -0,0 +1,76 @@
+"""
+Memoized section-level analysis results for incremental re-scoring.
+
+When a user edits one bullet and re-uploads, most of the resume is
+unchanged. ResumeAnalyzer keys the result of each section-level component
+(the skills found in a block of the resume, the summary, experience and
+education checks) by the SHA-256 of that section's body plus the options it
+depends on. Re-analysis then recomputes only the sections whose body
+changed and reassembles the ATS score from the cached component results.
+The cache is an in-process LRU bounded by entry count.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+def section_key(component, body, *parts):
+    """Cache key of one component computed from body (a string) and option sub-keys"""
+    digest = hashlib.sha256(body.encode('utf-8', 'surrogatepass')).hexdigest()
+    return ':'.join([component, digest] + [str(part) for part in parts])
+
+
+class SectionCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, component, body, compute_fn, parts=()):
+        """
+        Return (value, reused) for component over body, calling compute_fn()
+        on a miss. Values are shared between callers, so compute_fn should
+        return an immutable value such as a tuple.
+        """
+        key = section_key(component, body, *parts)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key], True
+            self.misses += 1
+
+        value = compute_fn()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the number of cached entries"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_section_cache():
+    """Return the process-wide section cache shared by every ResumeAnalyzer"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SectionCache()
+        return _shared_cache
@@ -0,0 +1,182 @@
+"""
+Single-pass section segmentation of resume text.
+
+The text is split into lines and lowercased once, and one Aho-Corasick scan
+finds every section keyword on every line. A single walk over the lines
+then tracks all sections at the same time, producing a section map (header
+spans, body lines and entries) that the ResumeAnalyzer extractors read
+instead of rescanning the text with their own keyword lists.
+"""
+
+from bisect import bisect_right
+
+from .skill_matcher import AhoCorasick
+
+# Keywords that open each extracted section; a line containing any of them
+# is a header (and also content, unless it is exactly the keyword)
+SECTION_KEYWORDS = {
+    'education': [
+        'education', 'academic', 'qualification', 'degree', 'university', 'college',
+        'school', 'institute', 'certification', 'diploma', 'bachelor', 'master',
+        'phd', 'b.tech', 'm.tech', 'b.e', 'm.e', 'b.sc', 'm.sc','bca', 'mca', 'b.com',
+        'm.com', 'b.cs-it', 'imca', 'bba', 'mba', 'honors', 'scholarship'
+    ],
+    'experience': [
+        'experience', 'employment', 'work history', 'professional experience',
+        'work experience', 'career history', 'professional background',
+        'employment history', 'job history', 'positions held', 'experience',
+        'job title', 'job responsibilities', 'job description', 'job summary'
+    ],
+    'projects': [
+        'projects', 'personal projects', 'academic projects', 'key projects',
+        'major projects', 'professional projects', 'project experience',
+        'relevant projects', 'featured projects','latest projects',
+        'top projects'
+    ],
+    'skills': [
+        'skills', 'technical skills', 'competencies', 'expertise',
+        'core competencies', 'professional skills', 'key skills',
+        'technical expertise', 'proficiencies', 'qualifications',
+        'top skills', 'key skill', 'major skill', 'personal skill',
+        'soft skills', 'soft skill', 'soft skillset'
+    ],
+    'summary': [
+        'summary', 'professional summary', 'career summary', 'objective',
+        'career objective', 'professional objective', 'about me', 'profile',
+        'professional profile', 'career profile', 'overview', 'skill summary'
+    ]
+}
+
+# Keywords whose presence anywhere in the resume counts towards the section score
+ESSENTIAL_SECTIONS = {
+    'contact': ['email', 'phone', 'address', 'linkedin'],
+    'education': ['education', 'university', 'college', 'degree', 'academic'],
+    'experience': ['experience', 'work', 'employment', 'job', 'internship'],
+    'skills': ['skills', 'technologies', 'tools', 'proficiencies', 'expertise']
+}
+
+
+class SegmentedResume:
+    """
+    Section map of one resume text.
+
+    lines are the stripped lines and lowered their lowercase form;
+    line_offsets[i] is where lines[i] starts in the original text. sections
+    maps each section name to a list of {'header_line', 'header_span',
+    'body_lines'} in document order, entries maps it to the extracted entry
+    strings, and keywords maps each keyword group to the keywords found
+    anywhere in the text.
+    """
+
+    def __init__(self, text, lines, lowered, line_offsets, sections, entries, keywords):
+        self.text = text
+        self.lines = lines
+        self.lowered = lowered
+        self.line_offsets = line_offsets
+        self.sections = sections
+        self.entries = entries
+        self.keywords = keywords
+
+
+class SectionSegmenter:
+    """
+    Compiles the section keyword lists once and segments resume text with a
+    single keyword scan and a single walk over its lines.
+
+    section_keywords maps section names to header keywords, boundary_keywords
+    are the keywords that end any open section, and keyword_groups are extra
+    named keyword lists whose presence in the text is reported.
+    """
+
+    def __init__(self, section_keywords=None, boundary_keywords=(), keyword_groups=None):
+        self.section_keywords = section_keywords or SECTION_KEYWORDS
+        self.keyword_groups = keyword_groups or {}
+
+        groups = {('section', name): keywords for name, keywords in self.section_keywords.items()}
+        groups[('boundary', None)] = boundary_keywords
+        groups.update({('group', name): keywords for name, keywords in self.keyword_groups.items()})
+
+        # Each distinct keyword is one pattern that may belong to several groups
+        self._keyword_groups = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                self._keyword_groups.setdefault(keyword.lower(), set()).add(group)
+        self._exact = {name: set(keyword.lower() for keyword in keywords)
+                       for name, keywords in self.section_keywords.items()}
+        self._automaton = AhoCorasick(list(self._keyword_groups))
+
+    def segment(self, text, raw_lines=None):
+        """Return the SegmentedResume of text (raw_lines: text split on newlines, if already done)"""
+        if raw_lines is None:
+            raw_lines = text.split('\n')
+        lines = [line.strip() for line in raw_lines]
+        lowered = [line.lower() for line in lines]
+
+        line_offsets = []
+        offset = 0
+        for raw_line in raw_lines:
+            line_offsets.append(offset + len(raw_line) - len(raw_line.lstrip()))
+            offset += len(raw_line) + 1
+
+        # One scan over all lowercased lines finds every keyword occurrence
+        joined = '\n'.join(lowered)
+        starts = []
+        position = 0
+        for line in lowered:
+            starts.append(position)
+            position += len(line) + 1
+
+        hits = {}  # group -> set of line indexes containing one of its keywords
+        keywords = {name: set() for name in self.keyword_groups}
+        for start, _, index in self._automaton.iter_matches(joined):
+            keyword = self._automaton.patterns[index]
+            line_index = bisect_right(starts, start) - 1
+            for group in self._keyword_groups[keyword]:
+                hits.setdefault(group, set()).add(line_index)
+                if group[0] == 'group':
+                    keywords[group[1]].add(keyword)
+
+        boundary_lines = hits.get(('boundary', None), set())
+        sections = {name: [] for name in self.section_keywords}
+        entries = {name: [] for name in self.section_keywords}
+        header_lines = {name: hits.get(('section', name), set()) for name in self.section_keywords}
+        in_section = dict.fromkeys(self.section_keywords, False)
+        current = {name: [] for name in self.section_keywords}
+
+        for index, line in enumerate(lines):
+            for name in self.section_keywords:
+                entry = current[name]
+                if index in header_lines[name]:
+                    if lowered[index] not in self._exact[name]:
+                        # This line carries section content, not just a header
+                        entry.append(line)
+                    in_section[name] = True
+                    sections[name].append({
+                        'header_line': index,
+                        'header_span': (line_offsets[index], line_offsets[index] + len(line)),
+                        'body_lines': []
+                    })
+                    continue
+
+                if not in_section[name]:
+                    continue
+                if line and index in boundary_lines:
+                    # Another section starts here
+                    in_section[name] = False
+                    if entry:
+                        entries[name].append(' '.join(entry))
+                        current[name] = []
+                    continue
+
+                if line:
+                    entry.append(line)
+                    sections[name][-1]['body_lines'].append(index)
+                elif entry:  # Empty line and we have content
+                    entries[name].append(' '.join(entry))
+                    current[name] = []
+
+        for name, entry in current.items():
+            if entry:
+                entries[name].append(' '.join(entry))
+
+        return SegmentedResume(text, lines, lowered, line_offsets, sections, entries, keywords)
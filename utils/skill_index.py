@@ -0,0 +1,250 @@
+"""
+Alias-aware, typo-tolerant skill lookup.
+
+Skills, their aliases (config.skill_aliases.SKILL_ALIASES) and resume tokens
+are reduced to a compact form: lowercased, with spaces and punctuation other
+than '+' and '#' removed, so "Node.js", "NodeJS" and "node js" are all
+"nodejs". A hash map from compact form to canonical skill finds exact and
+alias hits, longest run of tokens first. A set of the prefixes of every
+compact form limits the multi-word lookups to runs that can still complete a
+skill, however the resume splits it ("node js", "ci/cd"). Only tokens left
+unmatched are looked up for typos, in a deletion index (all strings
+reachable from each skill by deleting up to MAX_DISTANCE characters). A
+typo lookup therefore costs the same however large the vocabulary is.
+"""
+
+import re
+import threading
+
+from .resume_document import ResumeDocument
+from .skill_matcher import job_role_skills
+
+# Characters dropped from the compact form (a leading '.' is kept, as in ".net")
+_SEPARATORS = re.compile(r'[^\w+#]|_')
+# A token is a run of word characters, optionally joined by '.', '+' or '#'
+_TOKEN = re.compile(r'\.?\w[\w+#.]*')
+
+# Typo matching: only for alphabetic tokens this long, one edit below
+# LONG_SKILL_LENGTH characters and MAX_DISTANCE edits from there on (two
+# edits stay under 20% of the word), judged on the shorter of token and skill
+MIN_FUZZY_LENGTH = 6
+LONG_SKILL_LENGTH = 11
+MAX_DISTANCE = 2
+# Typo lookups are remembered per token, up to this many before starting over
+FUZZY_CACHE_ENTRIES = 65536
+
+
+def compact(text):
+    """Compact form of a skill or token ("Node.js" -> "nodejs", ".NET" -> ".net")"""
+    text = text.strip().lower()
+    return ('.' if text.startswith('.') else '') + _SEPARATORS.sub('', text)
+
+
+def tokenize(text):
+    """Lowercased tokens of one line, without trailing dots"""
+    return [token.rstrip('.') for token in _TOKEN.findall(text.lower())]
+
+
+def allowed_distance(key):
+    """Edits tolerated in a word of this length (a compact skill key or token)"""
+    if len(key) < MIN_FUZZY_LENGTH:
+        return 0
+    return 1 if len(key) < LONG_SKILL_LENGTH else MAX_DISTANCE
+
+
+def typo_limit(token, key):
+    """
+    Edits tolerated between a resume token and a skill key: those allowed
+    for the shorter of the two, and none unless they share their first and
+    last letters. Typos rarely touch both ends, while the common words one
+    or two edits from a skill usually do ("mentoring" / "monitoring",
+    "docket" / "docker").
+    """
+    if token[0] != key[0] or token[-1] != key[-1]:
+        return 0
+    return min(allowed_distance(token), allowed_distance(key))
+
+
+def _deletions(word, distance):
+    """word and every string obtained by deleting up to distance characters from it"""
+    found = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {candidate[:i] + candidate[i + 1:] for candidate in frontier for i in range(len(candidate))}
+        found |= frontier
+    return found
+
+
+def edit_distance(a, b, limit):
+    """
+    Edit distance of a and b counting an adjacent transposition as one edit
+    (optimal string alignment), or limit + 1 once it is known to exceed limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i]
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            distance = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                distance = min(distance, before[j - 2] + 1)
+            current.append(distance)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class SkillIndex:
+    """
+    Finds the canonical skills of a vocabulary in text, through aliases and
+    small typos. aliases maps a canonical skill name to its alternative
+    spellings (SKILL_ALIASES by default).
+    """
+
+    def __init__(self, skills, aliases=None):
+        if aliases is None:
+            from config.skill_aliases import SKILL_ALIASES as aliases
+
+        self._canonical = {}  # compact form -> canonical key
+        self.names = {}       # canonical key -> skill name as first written
+
+        for canonical, alternatives in aliases.items():
+            key = compact(canonical)
+            for name in [canonical] + list(alternatives):
+                self._add(name, key)
+        for skill in skills:
+            key = compact(skill)
+            if not key:
+                continue
+            key = self._canonical.get(key, key)
+            self._add(skill, key)
+            self.names.setdefault(key, skill.strip())
+
+        # Proper prefixes of every compact form, to know when a run of tokens can still grow
+        self._prefixes = {form[:end] for form in self._canonical for end in range(1, len(form))}
+
+        # Typos are matched against the canonical spelling of vocabulary skills only
+        self._fuzzy_cache = {}
+        self._deletion_index = {}
+        for key in self.names:
+            distance = allowed_distance(key)
+            if distance and key.isalpha():
+                for deletion in _deletions(key, distance):
+                    self._deletion_index.setdefault(deletion, set()).add(key)
+
+    def _add(self, name, key):
+        self._canonical.setdefault(compact(name), key)
+        # The same name as a run of resume tokens (differs only for a leading '.' inside it)
+        tokens = [compact(token) for token in tokenize(name)]
+        if tokens:
+            self._canonical.setdefault(tokens[0] + ''.join(token.lstrip('.') for token in tokens[1:]), key)
+
+    def canonical(self, skill):
+        """Canonical key of a skill name or alias (its compact form if unknown)"""
+        key = compact(skill)
+        return self._canonical.get(key, key)
+
+    def _fuzzy(self, token):
+        """Canonical key of the closest vocabulary skill within its allowed distance, or None"""
+        if token in self._fuzzy_cache:
+            return self._fuzzy_cache[token]
+        best, best_distance = None, MAX_DISTANCE + 1
+        for deletion in _deletions(token, allowed_distance(token)):
+            for key in self._deletion_index.get(deletion, ()):
+                limit = typo_limit(token, key)
+                if not limit:
+                    continue
+                distance = edit_distance(token, key, limit)
+                if distance <= limit and (distance, key) < (best_distance, best or ''):
+                    best, best_distance = key, distance
+        if len(self._fuzzy_cache) >= FUZZY_CACHE_ENTRIES:
+            self._fuzzy_cache.clear()
+        self._fuzzy_cache[token] = best
+        return best
+
+    def find(self, text):
+        """
+        Return {canonical key: 'exact' | 'alias' | 'fuzzy'} for every skill
+        found in text (a string or ResumeDocument). Multi-word skills only
+        match within one line.
+        """
+        lowered = text.lower_text if isinstance(text, ResumeDocument) else text.lower()
+        found = {}
+        unmatched = set()
+        compacted = {}  # token -> compact form, for tokens repeated in the text
+        for line in lowered.split('\n'):
+            tokens = tokenize(line)
+            forms = []
+            for token in tokens:
+                form = compacted.get(token)
+                if form is None:
+                    form = compacted[token] = compact(token)
+                forms.append(form)
+            bare = [form.lstrip('.') for form in forms]
+            i = 0
+            while i < len(tokens):
+                run, best = forms[i], 0
+                if run in self._canonical:
+                    best = 1
+                n = 1
+                while run in self._prefixes and i + n < len(tokens):
+                    run += bare[i + n]
+                    n += 1
+                    if run in self._canonical:
+                        best = n
+                if best:
+                    form = forms[i] + ''.join(bare[i + 1:i + best])
+                    key = self._canonical[form]
+                    found[key] = 'exact' if form == key or found.get(key) == 'exact' else 'alias'
+                    i += best
+                else:
+                    if len(forms[i]) >= MIN_FUZZY_LENGTH and forms[i].isalpha():
+                        unmatched.add(forms[i])
+                    i += 1
+
+        for token in unmatched:
+            key = self._fuzzy(token)
+            if key is not None and key not in found:
+                found[key] = 'fuzzy'
+        return found
+
+    def skills_in(self, text):
+        """Names of the vocabulary skills found in text, in vocabulary order"""
+        found = self.find(text)
+        return [name for key, name in self.names.items() if key in found]
+
+    def matched_skills(self, text, skills):
+        """The skills (lowercased, as SkillMatcher reports them) whose canonical skill is in text"""
+        found = self.find(text)
+        return {skill.strip().lower() for skill in skills if self.canonical(skill) in found}
+
+
+_shared_index = None
+_extended_indexes = {}
+_index_lock = threading.Lock()
+# Indexes built for skill lists outside JOB_ROLES are kept, up to this many
+MAX_EXTENDED_INDEXES = 32
+
+
+def get_skill_index(extra_skills=()):
+    """
+    Return the process-wide index over the JOB_ROLES skills, or one that
+    also covers extra_skills outside that vocabulary (built once per list)
+    """
+    global _shared_index
+    with _index_lock:
+        if _shared_index is None:
+            _shared_index = SkillIndex(job_role_skills())
+        unknown = frozenset(skill.strip() for skill in extra_skills
+                            if compact(skill) and _shared_index.canonical(skill) not in _shared_index.names)
+        if not unknown:
+            return _shared_index
+        index = _extended_indexes.get(unknown)
+        if index is None:
+            if len(_extended_indexes) >= MAX_EXTENDED_INDEXES:
+                _extended_indexes.pop(next(iter(_extended_indexes)))
+            index = _extended_indexes[unknown] = SkillIndex(job_role_skills() + sorted(unknown))
+        return index
@@ -0,0 +1,201 @@
+"""
+Multi-pattern skill matching.
+
+An Aho-Corasick automaton is compiled once from every skill in
+config.job_roles.JOB_ROLES and finds all skill occurrences in a resume in a
+single pass over its lowercased text, however many skills or roles are being
+scored. Matches must sit on word boundaries, so "Java" is not found inside
+"JavaScript" while "C++" and "Node.js" still match.
+"""
+
+import threading
+from collections import deque
+
+from .resume_document import ResumeDocument
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a list of (already normalized) patterns.
+    Uses the pyahocorasick C extension when it is installed and a pure-Python
+    automaton otherwise.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        try:
+            import ahocorasick
+        except ImportError:
+            ahocorasick = None
+
+        if ahocorasick is not None:
+            self._native = ahocorasick.Automaton()
+            for index, pattern in enumerate(self.patterns):
+                self._native.add_word(pattern, index)
+            if self.patterns:
+                self._native.make_automaton()
+            return
+
+        self._native = None
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        # Breadth-first so every failure link points at a shallower state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                # Patterns that end at the failure state also end here
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text):
+        """Yield (start, end, pattern_index) for every occurrence in text"""
+        if self._native is not None:
+            if self.patterns:
+                for last, index in self._native.iter(text):
+                    yield last + 1 - len(self.patterns[index]), last + 1, index
+            return
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                yield position + 1 - len(self.patterns[index]), position + 1, index
+
+
+def _on_word_boundary(text, start, end, pattern):
+    """A match is only a word if it is not glued to letters or digits on either side"""
+    if pattern[0].isalnum() and start > 0 and text[start - 1].isalnum():
+        return False
+    if pattern[-1].isalnum() and end < len(text) and text[end].isalnum():
+        return False
+    return True
+
+
+class SkillMatcher:
+    """Finds every occurrence of a fixed skill vocabulary in one pass"""
+
+    def __init__(self, skills):
+        self.patterns = []
+        seen = set()
+        for skill in skills:
+            pattern = skill.strip().lower()
+            if pattern and pattern not in seen:
+                seen.add(pattern)
+                self.patterns.append(pattern)
+        self._vocabulary = seen
+        self._automaton = AhoCorasick(self.patterns)
+
+    def __contains__(self, skill):
+        return skill.strip().lower() in self._vocabulary
+
+    def find_all(self, text):
+        """
+        Return {lowercased skill: [(start, end), ...]} for every skill found
+        in text (a string or ResumeDocument) on word boundaries. Offsets
+        index into the lowercased text.
+        """
+        lowered = text.lower_text if isinstance(text, ResumeDocument) else text.lower()
+        occurrences = {}
+        for start, end, index in self._automaton.iter_matches(lowered):
+            pattern = self.patterns[index]
+            if _on_word_boundary(lowered, start, end, pattern):
+                occurrences.setdefault(pattern, []).append((start, end))
+        return occurrences
+
+    @staticmethod
+    def keyword_match(occurrences, required_skills):
+        """Build a calculate_keyword_match() result from find_all() output"""
+        found_skills = []
+        missing_skills = []
+        for skill in required_skills:
+            if skill.strip().lower() in occurrences:
+                found_skills.append(skill)
+            else:
+                missing_skills.append(skill)
+
+        match_score = (len(found_skills) / len(required_skills)) * 100 if required_skills else 0
+        return {
+            'score': match_score,
+            'found_skills': found_skills,
+            'missing_skills': missing_skills
+        }
+
+    def match(self, text, required_skills):
+        """Score text against one list of required skills"""
+        return self.keyword_match(self.find_all(text), required_skills)
+
+    def match_roles(self, text, roles):
+        """Score text against {role: required_skills} from a single pass over the text"""
+        occurrences = self.find_all(text)
+        return {role: self.keyword_match(occurrences, skills) for role, skills in roles.items()}
+
+
+def iter_job_roles(job_roles=None):
+    """Yield (category, role, role_info) for every role in JOB_ROLES"""
+    if job_roles is None:
+        from config.job_roles import JOB_ROLES as job_roles
+    for category, roles in job_roles.items():
+        for role, role_info in roles.items():
+            yield category, role, role_info
+
+
+def job_role_skills(job_roles=None):
+    """Every required and recommended skill named in JOB_ROLES, in first-seen order"""
+    skills = []
+    for _, _, role_info in iter_job_roles(job_roles):
+        skills.extend(role_info.get('required_skills', []))
+        for group in role_info.get('recommended_skills', {}).values():
+            skills.extend(group)
+    return list(dict.fromkeys(skills))
+
+
+_shared_matcher = None
+_extended_matchers = {}
+_matcher_lock = threading.Lock()
+# Matchers built for skill lists outside JOB_ROLES are kept, up to this many
+MAX_EXTENDED_MATCHERS = 32
+
+
+def get_skill_matcher(extra_skills=()):
+    """
+    Return the process-wide matcher compiled from JOB_ROLES. If extra_skills
+    contains skills outside that vocabulary, a matcher covering both is
+    compiled once and reused for the same extra skills.
+    """
+    global _shared_matcher
+    with _matcher_lock:
+        if _shared_matcher is None:
+            _shared_matcher = SkillMatcher(job_role_skills())
+        unknown = frozenset(skill.strip().lower() for skill in extra_skills
+                            if skill.strip() and skill not in _shared_matcher)
+        if not unknown:
+            return _shared_matcher
+        matcher = _extended_matchers.get(unknown)
+        if matcher is None:
+            if len(_extended_matchers) >= MAX_EXTENDED_MATCHERS:
+                _extended_matchers.pop(next(iter(_extended_matchers)))
+            matcher = _extended_matchers[unknown] = SkillMatcher(_shared_matcher.patterns + sorted(unknown))
+        return matcher
@@ -0,0 +1,145 @@
+"""
+Opt-in per-stage timing of the analysis pipeline.
+
+An analyzer with profiling enabled creates one StageTimer per call and
+marks the end of each stage with lap(). Durations come from the monotonic
+time.perf_counter() clock. The per-call timings are returned in the result's
+'timings' block and every lap is also added to a process-wide histogram, so
+the admin dashboard can show p50/p95/p99 per stage. With profiling off, the
+timer's methods do nothing and no histogram is touched.
+
+Histograms use fixed log-spaced buckets, so their memory stays constant
+however many analyses a process runs; percentiles are accurate to one
+bucket (about 19%).
+"""
+
+import math
+import os
+import threading
+import time
+
+# Profiling is off unless PROFILE_STAGES=1 (or an analyzer is built with profile_stages=True)
+DEFAULT_PROFILE_STAGES = os.getenv('PROFILE_STAGES', '0').lower() in ('1', 'true', 'yes')
+
+# Bucket i holds durations in [MIN_SECONDS * GROWTH**(i-1), MIN_SECONDS * GROWTH**i)
+MIN_SECONDS = 1e-5
+GROWTH = 2 ** 0.25
+BUCKETS = 112  # Up to about 4 hours
+
+
+class StageHistogram:
+    """Duration distribution and mean input size of one stage"""
+
+    def __init__(self):
+        self.counts = [0] * (BUCKETS + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.total_size = 0
+        self.sized = 0
+
+    def record(self, seconds, size=None):
+        if seconds < MIN_SECONDS:
+            bucket = 0
+        else:
+            bucket = min(BUCKETS, int(math.log(seconds / MIN_SECONDS, GROWTH)) + 1)
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if size is not None:
+            self.total_size += size
+            self.sized += 1
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of durations, capped at the max"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(MIN_SECONDS * GROWTH ** bucket, self.max_seconds)
+        return self.max_seconds
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'p50': self.percentile(0.50),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'mean': self.total_seconds / self.count if self.count else 0.0,
+            'max': self.max_seconds,
+            'mean_input_size': self.total_size / self.sized if self.sized else None
+        }
+
+
+class StageHistograms:
+    """Thread-safe StageHistogram per (source, stage)"""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, source, stage, seconds, size=None):
+        with self._lock:
+            histogram = self._histograms.get((source, stage))
+            if histogram is None:
+                histogram = self._histograms[(source, stage)] = StageHistogram()
+            histogram.record(seconds, size)
+
+    def summaries(self):
+        """Return [{'source', 'stage', 'count', 'p50', 'p95', 'p99', ...}] in first-recorded order"""
+        with self._lock:
+            return [{'source': source, 'stage': stage, **histogram.summary()}
+                    for (source, stage), histogram in self._histograms.items()]
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+_histograms = StageHistograms()
+
+
+def get_stage_histograms():
+    """Return the process-wide stage histograms"""
+    return _histograms
+
+
+class StageTimer:
+    """
+    Times consecutive stages of one call. lap(stage, size) records the time
+    since the previous lap (or since the timer was created) as that stage,
+    with the size of its input (characters, bytes or items).
+    """
+
+    def __init__(self, source, enabled=True, histograms=None):
+        self.source = source
+        self.enabled = enabled
+        self.histograms = histograms or _histograms
+        self.stages = {}
+        self._start = self._last = time.perf_counter() if enabled else 0.0
+
+    def lap(self, stage, size=None):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        seconds = now - self._last
+        self._last = now
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = {'seconds': seconds, 'input_size': size}
+        else:
+            entry['seconds'] += seconds
+        self.histograms.record(self.source, stage, seconds, size)
+
+    def finish(self, result):
+        """Add the 'timings' block to result (a dict) and record the total; returns result"""
+        if not self.enabled:
+            return result
+        total = time.perf_counter() - self._start
+        self.histograms.record(self.source, 'total', total)
+        result['timings'] = {'stages': self.stages, 'total_seconds': total}
+        return result